@@ -144,12 +144,15 @@ a selection wheel like in iOS has been created by subclassing it.
 
 __version__ = '0.1.1'
 
-from bisect import bisect_left, bisect
+from array import array
+from bisect import bisect_left, bisect, insort
+from collections import OrderedDict, deque
 from kivy.clock import Clock
 from kivy.core.text import Label as CoreLabel
 from kivy.effects.dampedscroll import DampedScrollEffect
 from kivy.graphics import InstructionGroup, Mesh
-from kivy.graphics.context_instructions import Color
+from kivy.graphics.context_instructions import Color, PushMatrix, \
+    PopMatrix, Translate
 from kivy.graphics.vertex_instructions import Rectangle, Line
 from kivy.metrics import dp, sp
 from kivy.properties import ListProperty, NumericProperty, OptionProperty, \
@@ -160,8 +163,631 @@ from kivy.uix.button import Button
 from kivy.uix.stencilview import StencilView
 from kivy.uix.widget import Widget
 from kivy.vector import Vector
-from math import ceil, floor
+from math import ceil, floor, log
+from struct import Struct
 from kivy.graphics.vertex_instructions import BorderImage
+from kivy.graphics.texture import Texture
+from kivy.logger import Logger
+from timeit import default_timer
+from weakref import ref
+import json
+import os
+try:
+    import numpy as np
+except ImportError:
+    np = None
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = None
+
+def _defining_class(obj, name):
+    '''return the class in the MRO of ``obj`` that defines attribute ``name``.'''
+    for cls in type(obj).__mro__:
+        if name in cls.__dict__:
+            return cls
+
+def _override(obj, name, value):
+    '''set the instance attribute ``name`` of ``obj`` to ``value``, and 
+    return a function undoing it. Overrides must be undone in reverse 
+    order.'''
+    had, previous = name in obj.__dict__, obj.__dict__.get(name)
+    setattr(obj, name, value)
+    
+    def restore():
+        if had:
+            setattr(obj, name, previous)
+        else:
+            delattr(obj, name)
+    return restore
+
+def _skip_register(*args, **kw):
+    pass
+
+def _register_run(labeller, tick, indices, rects):
+    '''hand a run of ticks to ``labeller``, one by one if it has no
+    :meth:`~TickLabeller.register_run`.'''
+    try:
+        register_run = labeller.register_run
+    except AttributeError:
+        register = labeller.register
+        for tick_index, tick_info in zip(indices, rects):
+            register(tick, tick_index, tick_info)
+        return
+    register_run(tick, indices, rects)
+
+def _options_key(kw):
+    '''a hashable key for the Label keyword args ``kw``.'''
+    return tuple(sorted((k, tuple(v) if isinstance(v, list) else v)
+                        for k, v in kw.items()))
+
+_quad_index_buffer = array('H')
+
+def _quad_indices(n_quads):
+    '''return a view on the indices drawing ``n_quads`` quads of 4 vertices
+    each as pairs of triangles. The underlying buffer is shared by every
+    Mesh, and grows by doubling whenever more quads are needed.'''
+    global _quad_index_buffer
+    n = 6 * n_quads
+    indices = _quad_index_buffer
+    if n > len(indices):
+        n_old = len(indices) // 6
+        n_new = max(n_quads, 2 * n_old, 64)
+        if 4 * n_new > 65536:
+            n_new = max(n_quads, 65536 // 4)
+        # build a new buffer, as the current one may be exported to meshes
+        indices = array('H', indices)
+        indices.extend(4 * q + i for q in range(n_old, n_new) 
+                       for i in (0, 1, 2, 2, 3, 0))
+        _quad_index_buffer = indices
+    return memoryview(indices)[:n]
+
+class QuadBuffer(object):
+    '''a growable buffer of axis aligned rectangles, laid out as the vertices
+    of a Mesh in ``triangles`` mode with a position-only vertex format, 
+    :attr:`fmt`. 
+    
+    Each quad takes 4 vertices of 2 floats, with no texture coordinates,
+    and is drawn through an index buffer shared by all meshes. The floats
+    are kept in an ``array('f')`` that is reused from one redraw to the next.
+    Its capacity doubles whenever it's full, and never shrinks.
+    
+    .. note::
+        Since mesh indices are unsigned shorts, a single Mesh can draw at
+        most :attr:`max_quads` quads. Larger buffers are applied to several
+        meshes, :attr:`max_quads` at a time.
+    
+    .. versionadded:: 0.2.0
+    '''
+    
+    fmt = [(b'vPosition', 2, 'float')]
+    '''vertex format of the meshes this buffer is applied to.'''
+    
+    max_quads = 65536 // 4
+    '''the maximal number of quads drawn by a single Mesh.'''
+    
+    def __init__(self, capacity=64):
+        self.data = array('f', [0.]) * (8 * capacity)
+        self.size = 0
+        
+    def __len__(self):
+        '''the number of quads in the buffer.'''
+        return self.size // 8
+    
+    def reset(self):
+        '''empty the buffer, keeping its capacity.'''
+        self.size = 0
+        
+    def reserve(self, n_quads):
+        '''make room for ``n_quads`` more quads.'''
+        needed = self.size + 8 * n_quads
+        data = self.data
+        if needed > len(data):
+            # grow into a new array: the current one may be exported to a mesh
+            grown = array('f', [0.]) * max(needed, 2 * len(data))
+            grown[:self.size] = data[:self.size]
+            self.data = data = grown
+        return data
+    
+    def add_quad(self, x, y, width, height):
+        n = self.size
+        data = self.data
+        if n + 8 > len(data):
+            data = self.reserve(1)
+        x1 = x + width
+        y1 = y + height
+        data[n] = x
+        data[n + 1] = y
+        data[n + 2] = x1
+        data[n + 3] = y
+        data[n + 4] = x1
+        data[n + 5] = y1
+        data[n + 6] = x
+        data[n + 7] = y1
+        self.size = n + 8
+        
+    def add_quads(self, x, y, width, height):
+        '''add many quads at once. The arguments are numpy arrays or scalars,
+        broadcast against each other.'''
+        x, y, width, height = np.broadcast_arrays(x, y, width, height)
+        n_quads = len(x)
+        if not n_quads:
+            return
+        quads = np.empty((n_quads, 4, 2), dtype='f')
+        x1 = x + width
+        y1 = y + height
+        quads[:, (0, 3), 0] = x[:, None]
+        quads[:, (1, 2), 0] = x1[:, None]
+        quads[:, (0, 1), 1] = y[:, None]
+        quads[:, (2, 3), 1] = y1[:, None]
+        n = self.size
+        data = self.reserve(n_quads)
+        memoryview(data)[n:n + 8 * n_quads] = quads.ravel()
+        self.size = n + 8 * n_quads
+        
+    def mesh_count(self):
+        '''the number of meshes needed to draw this buffer.'''
+        return max(1, -(-len(self) // self.max_quads))
+    
+    def apply(self, mesh, chunk=0):
+        '''hand the quads of this buffer to ``mesh``. If there are more than
+        :attr:`max_quads`, ``chunk`` selects which of them go to ``mesh``.'''
+        start = chunk * self.max_quads * 8
+        stop = min(self.size, start + self.max_quads * 8)
+        if stop <= start:
+            # kivy can't take empty buffers
+            mesh.vertices = []
+            mesh.indices = []
+            return
+        mesh.vertices = memoryview(self.data)[start:stop]
+        mesh.indices = _quad_indices((stop - start) // 8)
+
+class TickBatch(object):
+    '''the vertices of several :class:`Tick`\ s, drawn together by a 
+    single Mesh. See :attr:`Tickline.batch_ticks`.
+    
+    Each tick still computes its quads into its own :class:`QuadBuffer` 
+    with :meth:`Tick.draw_ticks`. They are then interleaved into one 
+    buffer, where the texture coordinates of every vertex point to the
+    texel holding the color of its tick in a small palette texture. This 
+    gives per-vertex color with the default shader, at the cost of one
+    draw call and no color changes for all the ticks. The batch ends by
+    setting the color of its last tick, as drawing that tick on its own 
+    would, since labels are drawn in the current color.
+    
+    .. versionadded:: 0.2.0
+    '''
+    
+    fmt = [(b'vPosition', 2, 'float'), (b'vTexCoords0', 2, 'float')]
+    '''vertex format of the meshes of the batch.'''
+    
+    def __init__(self):
+        self.ticks = []
+        self.data = array('f')
+        self.size = 0
+        self.palette = None
+        self.instr = instr = InstructionGroup()
+        self._mesh_group = InstructionGroup()
+        self._color = Color(1, 1, 1, 1)
+        instr.add(Color(1, 1, 1, 1))
+        instr.add(self._mesh_group)
+        instr.add(self._color)
+        self._meshes = []
+        
+    def __contains__(self, tick):
+        return tick in self.ticks
+    
+    def set_ticks(self, ticks):
+        '''make ``ticks`` the ticks drawn by the batch.'''
+        for tick in self.ticks:
+            tick.unbind(tick_color=self.update_palette)
+        self.ticks = ticks = list(ticks)
+        for tick in ticks:
+            tick.bind(tick_color=self.update_palette)
+        self.update_palette()
+        
+    def update_palette(self, *args):
+        '''write the colors of the ticks to the palette texture.'''
+        ticks = self.ticks
+        if not ticks:
+            return
+        width = 1
+        while width < len(ticks):
+            width *= 2
+        palette = self.palette
+        if palette is None or palette.width != width:
+            self.palette = palette = Texture.create(size=(width, 1), 
+                                                    colorfmt='rgba')
+            palette.min_filter = palette.mag_filter = 'nearest'
+            for mesh in self._meshes:
+                mesh.texture = palette
+        pixels = bytearray(4 * width)
+        for k, tick in enumerate(ticks):
+            rgba = list(tick.tick_color) + [1] * (4 - len(tick.tick_color))
+            pixels[4 * k:4 * k + 4] = bytearray(
+                    int(round(min(max(c, 0), 1) * 255)) for c in rgba[:4])
+        palette.blit_buffer(bytes(pixels), colorfmt='rgba', 
+                            bufferfmt='ubyte')
+        self._color.rgba = ticks[-1].tick_color
+        
+    def reset(self):
+        self.size = 0
+        
+    def collect(self, tick, tickline):
+        '''compute the quads of ``tick``, one of :attr:`ticks`, and append
+        them to the batch.'''
+        vertices = tick._vertices
+        vertices.reset()
+        tick.draw_ticks(tickline)
+        size = vertices.size
+        if not size:
+            return
+        n = self.size
+        stop = n + 2 * size
+        data = self.data
+        if stop > len(data):
+            # grow into a new array: the current one may be exported to a mesh
+            grown = array('f', [0.]) * max(stop, 2 * len(data))
+            grown[:n] = data[:n]
+            self.data = data = grown
+        source = vertices.data
+        count = size // 2
+        data[n:stop:4] = source[0:size:2]
+        data[n + 1:stop:4] = source[1:size:2]
+        u = (self.ticks.index(tick) + .5) / self.palette.width
+        data[n + 2:stop:4] = array('f', [u]) * count
+        data[n + 3:stop:4] = array('f', [.5]) * count
+        self.size = stop
+        
+    def apply(self):
+        '''hand the collected quads to the meshes of the batch.'''
+        if not self.ticks:
+            return
+        max_quads = QuadBuffer.max_quads
+        n_quads = self.size // 16
+        meshes = self._meshes
+        for _ in range(len(meshes), max(1, -(-n_quads // max_quads))):
+            mesh = Mesh(fmt=self.fmt, mode='triangles', texture=self.palette)
+            meshes.append(mesh)
+            self._mesh_group.add(mesh)
+        for chunk, mesh in enumerate(meshes):
+            start = chunk * max_quads * 16
+            stop = min(self.size, start + max_quads * 16)
+            if stop <= start:
+                # kivy can't take empty buffers
+                mesh.vertices = []
+                mesh.indices = []
+                continue
+            mesh.vertices = memoryview(self.data)[start:stop]
+            mesh.indices = _quad_indices((stop - start) // 16)
+            
+class LabelTextureCache(object):
+    '''a bounded, least recently used cache of label textures.
+    
+    Rasterizing label text is by far the most expensive part of a redraw,
+    while panning mostly brings the same labels back on screen. Hence
+    :meth:`Tick.get_label_texture` looks up its textures here before creating
+    new ones.
+    
+    The cache is bounded both by the number of textures it holds, 
+    :attr:`max_entries`, and by the approximate memory they take, 
+    :attr:`max_bytes` (counting 4 bytes per pixel). Whenever either bound is
+    exceeded, the least recently used textures are evicted. Either bound may
+    be set to None to disable it.
+    
+    Keys are tuples whose first element identifies the owner of the texture
+    (the :class:`Tick` that produced it, by default), so that all the 
+    textures of an owner can be dropped at once with :meth:`invalidate`.
+    
+    :attr:`hits`, :attr:`misses` and :attr:`evictions` count lookups and
+    evictions since creation or the last :meth:`reset_stats`.
+    
+    .. versionadded:: 0.2.0
+    '''
+    
+    def __init__(self, max_entries=1024, max_bytes=16 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self.reset_stats()
+        
+    def __len__(self):
+        return len(self._entries)
+    
+    def __contains__(self, key):
+        return key in self._entries
+    
+    def get(self, key, default=None):
+        '''return the texture stored under ``key`` and mark it as most
+        recently used, or ``default`` if there's none.'''
+        entries = self._entries
+        try:
+            texture = entries.pop(key)
+        except KeyError:
+            self.misses += 1
+            return default
+        entries[key] = texture
+        self.hits += 1
+        return texture
+    
+    def peek(self, key, default=None):
+        '''return the texture stored under ``key``, or ``default``, without
+        marking it as used or counting the lookup.'''
+        return self._entries.get(key, default)
+    
+    def put(self, key, texture):
+        '''store ``texture`` under ``key``, evicting the least recently used
+        textures if the cache grows over budget.'''
+        entries = self._entries
+        if key in entries:
+            self.nbytes -= self._sizeof(entries.pop(key))
+        entries[key] = texture
+        self.nbytes += self._sizeof(texture)
+        self._trim()
+        
+    def invalidate(self, owner=None):
+        '''drop all textures whose key starts with ``owner``. If ``owner`` is
+        None, drop every texture.'''
+        if owner is None:
+            self._entries.clear()
+            self.nbytes = 0
+            return
+        entries = self._entries
+        for key in [k for k in entries if k[0] == owner]:
+            self.nbytes -= self._sizeof(entries.pop(key))
+            
+    def reset_stats(self):
+        self.hits = self.misses = self.evictions = 0
+        
+    def stats(self):
+        '''return a dict summarizing the usage of this cache.'''
+        return {'entries': len(self._entries), 'bytes': self.nbytes,
+                'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions}
+    
+    def _trim(self):
+        entries = self._entries
+        max_entries, max_bytes = self.max_entries, self.max_bytes
+        while entries and \
+            (max_entries is not None and len(entries) > max_entries or
+             max_bytes is not None and self.nbytes > max_bytes):
+            _, texture = entries.popitem(last=False)
+            self.nbytes -= self._sizeof(texture)
+            self.evictions += 1
+            
+    @staticmethod
+    def _sizeof(texture):
+        if texture is None:
+            return 0
+        return texture.width * texture.height * 4
+
+label_texture_cache = LabelTextureCache()
+'''the :class:`LabelTextureCache` shared by default by all :class:`Tick`s.'''
+
+class RedrawProfiler(object):
+    '''records what each redraw of a :class:`Tickline` spends its time on.
+    See :attr:`Tickline.profiler`.
+    
+    For every :meth:`Tickline.redraw_`, a record is appended to 
+    :attr:`records`. It's a dict holding:
+    
+        - ``tickline``: the uid of the redrawn :class:`Tickline`;
+        - ``start`` and ``duration``: in seconds, as given by
+          ``timeit.default_timer``;
+        - ``phases``: a list of dicts with a ``name``, a ``start`` and a
+          ``duration``, for ``re_init``, each :meth:`Tick.display` (named
+          after the class of the tick and its position in
+          :attr:`Tickline.ticks`, and also giving the ``ticks`` and ``labels``
+          it produced), ``batch`` when ticks are batched, and
+          ``make_labels``;
+        - the counters ``ticks`` (quads drawn), ``vertices`` (handed to
+          meshes), ``labels_registered``, ``label_textures_created`` (calls
+          to :meth:`Tick.render_label`) and ``label_cache_hits`` (from the 
+          :class:`LabelTextureCache`\ s of the ticks).
+    
+    :attr:`totals` sums the counters, and the number of ``redraws``, over 
+    all records. :meth:`dump_trace` writes the records in the Chrome trace
+    event format, for ``chrome://tracing`` or Perfetto.
+    
+    :param max_records: the number of most recent records kept.
+    
+    .. versionadded:: 0.2.0
+    '''
+    
+    counters = ('ticks', 'vertices', 'labels_registered', 
+                'label_textures_created', 'label_cache_hits')
+    
+    def __init__(self, max_records=1000):
+        self.records = deque(maxlen=max_records)
+        self.reset()
+        self._record = None
+        
+    def reset(self):
+        '''forget the records and zero the totals.'''
+        self.records.clear()
+        self.totals = dict((name, 0) for name in self.counters)
+        self.totals['redraws'] = 0
+        
+    def begin(self, tickline):
+        '''start recording a redraw of ``tickline``.'''
+        now = default_timer()
+        self._record = record = dict((name, 0) for name in self.counters)
+        record.update(tickline=tickline.uid, start=now, phases=[])
+        self._mark = now
+        self._caches = set(tick.label_cache for tick in tickline.ticks
+                           if tick.label_cache is not None)
+        self._cache_hits = self._count_hits()
+        self._registered = 0
+        self._rendered = 0
+        labeller = tickline.labeller
+        register = labeller.register
+        register_run = getattr(labeller, 'register_run', None)
+        
+        def counting_register(*args, **kw):
+            self._registered += 1
+            return register(*args, **kw)
+        
+        def counting_register_run(tick, indices, rects):
+            registered = self._registered
+            register_run(tick, indices, rects)
+            # unless the run went through counting_register
+            if self._registered == registered:
+                self._registered += len(indices)
+        restore = [_override(labeller, 'register', counting_register)]
+        if register_run is not None:
+            restore.append(_override(labeller, 'register_run', 
+                                     counting_register_run))
+        for tick in tickline.ticks:
+            restore.append(_override(tick, 'render_label', 
+                                     self._counting_render(tick)))
+        self._restore = restore
+        
+    def mark(self, name, **args):
+        '''end the phase ``name``, which started at the previous mark.'''
+        now = default_timer()
+        phase = dict(name=name, start=self._mark, duration=now - self._mark)
+        phase.update(args)
+        self._record['phases'].append(phase)
+        self._mark = now
+        
+    def mark_tick(self, tick, index):
+        '''end the phase drawing ``tick``, the ``index``-th tick.'''
+        n_quads = len(tick._vertices)
+        record = self._record
+        record['ticks'] += n_quads
+        record['vertices'] += 4 * n_quads
+        labels = self._registered - record['labels_registered']
+        record['labels_registered'] = self._registered
+        self.mark('%s[%d]' % (type(tick).__name__, index), ticks=n_quads,
+                  labels=labels)
+        
+    def end(self):
+        '''finish the record of the redraw and return it.'''
+        record = self._record
+        self._record = None
+        for restore in reversed(self._restore):
+            restore()
+        self._restore = None
+        record['duration'] = default_timer() - record['start']
+        record['labels_registered'] = self._registered
+        record['label_cache_hits'] = self._count_hits() - self._cache_hits
+        record['label_textures_created'] = self._rendered
+        self._caches = None
+        totals = self.totals
+        for name in self.counters:
+            totals[name] += record[name]
+        totals['redraws'] += 1
+        self.records.append(record)
+        return record
+    
+    def trace(self):
+        '''return the records as a dict in the Chrome trace event format.'''
+        pid = os.getpid()
+        events = []
+        for record in self.records:
+            tid = record['tickline']
+            events.append(dict(name='redraw', cat='tickline', ph='X', 
+                               pid=pid, tid=tid, ts=record['start'] * 1e6,
+                               dur=record['duration'] * 1e6))
+            for phase in record['phases']:
+                args = dict((k, v) for k, v in phase.items() 
+                            if k not in ('name', 'start', 'duration'))
+                events.append(dict(name=phase['name'], cat='tickline', 
+                                   ph='X', pid=pid, tid=tid, 
+                                   ts=phase['start'] * 1e6,
+                                   dur=phase['duration'] * 1e6, args=args))
+            events.append(dict(name='redraw counters', cat='tickline', 
+                               ph='C', pid=pid, tid=tid, 
+                               ts=(record['start'] + record['duration']) * 1e6,
+                               args=dict((name, record[name])
+                                         for name in self.counters)))
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+    
+    def dump_trace(self, path):
+        '''write :meth:`trace` to ``path`` as json.'''
+        with open(path, 'w') as f:
+            json.dump(self.trace(), f)
+            
+    def _counting_render(self, tick):
+        render_label = tick.render_label
+        
+        def counting_render_label(*args, **kw):
+            self._rendered += 1
+            return render_label(*args, **kw)
+        return counting_render_label
+    
+    def _count_hits(self):
+        return sum(cache.hits for cache in self._caches)
+
+class RectanglePool(object):
+    '''a pool of Rectangle instructions that are reused from one redraw to
+    the next, instead of being removed and recreated.
+    
+    The rectangles live in :attr:`instr`, an InstructionGroup that is added 
+    once to a canvas by :meth:`attach`. Each :meth:`update` reassigns the 
+    texture, position and size of the pooled rectangles, creating new ones
+    only if the pool is too small. Surplus rectangles are hidden, and trimmed
+    once the pool is more than twice as large as needed.
+    
+    Any labeller, including ducktyped ones and the sublabellers of a
+    :class:`CompositeLabeller`, can use a pool to draw its labels.
+    
+    :param group: the group of :attr:`instr`, so that it can still be 
+        removed from a canvas with ``remove_group``.
+    
+    .. versionadded:: 0.2.0
+    '''
+    
+    min_size = 16
+    '''the pool is never trimmed below this many rectangles.'''
+    
+    def __init__(self, group=None):
+        self.instr = InstructionGroup(group=group)
+        self.rects = []
+        
+    def attach(self, canvas):
+        '''add :attr:`instr` to ``canvas`` if it's not already there.'''
+        if canvas.indexof(self.instr) < 0:
+            canvas.add(self.instr)
+            
+    def detach(self, canvas):
+        '''remove :attr:`instr` from ``canvas`` if it's there.'''
+        if canvas.indexof(self.instr) >= 0:
+            canvas.remove(self.instr)
+            
+    def update(self, items):
+        '''display the rectangles given by ``items``, an iterable of triples
+        ``(texture, pos, size)``, and hide the rest of the pool.'''
+        rects = self.rects
+        n_rects = len(rects)
+        n = 0
+        for texture, pos, size in items:
+            if n < n_rects:
+                rect = rects[n]
+                rect.texture = texture
+                rect.pos = pos
+                rect.size = size
+            else:
+                rect = Rectangle(texture=texture, pos=pos, size=size)
+                rects.append(rect)
+                self.instr.add(rect)
+            n += 1
+        self.trim(n)
+        
+    def trim(self, n):
+        '''keep only the first ``n`` rectangles visible.'''
+        rects = self.rects
+        if len(rects) > max(2 * n, self.min_size):
+            instr = self.instr
+            keep = max(n, self.min_size)
+            for rect in rects[keep:]:
+                instr.remove(rect)
+            del rects[keep:]
+        for rect in rects[n:]:
+            if rect.texture is not None:
+                rect.texture = None
+                rect.size = (0, 0)
 
 class TickLabeller(Widget):
     '''handles labelling and/or custom graphics for a :class:`Tickline`. 
@@ -180,17 +806,32 @@ class TickLabeller(Widget):
     
     During the redraw, ticks that need to be labelled should called 
     :meth:`register` to register the relevant information for rendering
-    a label.
+    a label, or :meth:`register_run` to register many at once.
     
     Finally, at the end of redraw, :class:`Tickline` calls :meth:`make_labels`
-    to produce the labels. Note that it is not required to reproduce labels
+    to produce the labels. When the labeller is replaced, :class:`Tickline`
+    calls :meth:`detach`, if there's one, to remove what it drew. Note that it is not required to reproduce labels
     in :meth:`make_labels` at every run, or to delay the production of labels
     to :meth:`make_labels` --- it is entirely possible to label on demand
     in :meth:`register`. 
     
     As a generic labeller, :class:`TickLabeller` only seeks to prevent 
-    overlapping labels. It still relies on the :class:`Tick`s to produce
-    the actual label texture through :meth:`Tick.get_label_texture`.
+    overlapping labels (see :meth:`resolve_collisions`). It still relies on 
+    the :class:`Tick`s to produce the actual label texture through 
+    :meth:`Tick.get_label_texture`. Labels are placed by the size given by
+    :meth:`Tick.measure_label`, and only the textures of the labels left 
+    after resolving overlaps are obtained, in :meth:`make_labels`.
+    
+    :attr:`registrar` maps the spot a label competes for to an entry
+    ``(texture, size, tick, tick_index, tick_info, pos, scale_factor)``, 
+    where ``texture`` is None until obtained. Entries ``(texture, pos, 
+    scale_factor)``, as registered by this class before, are still drawn 
+    and resolved, so a subclass overriding :meth:`register` only may keep
+    registering them.
+    
+    .. versionchanged:: 0.2.0
+        Entries hold the size and the tick of the label, and the texture
+        may be left for :meth:`make_labels` to obtain.
     
     A class can inherit from this or just ducktype to be used similarly
     with :class:`Tickline` and :class:`Tick`.'''
@@ -199,6 +840,8 @@ class TickLabeller(Widget):
         super(TickLabeller, self).__init__(**kw)
         self.tickline = tickline
         self.registrar = {}
+        self.drawn = []
+        self.pool = RectanglePool(group=self.group_id)
         
     def re_init(self, *args):
         '''method for reinitializing and accept registrations from a new
@@ -206,41 +849,223 @@ class TickLabeller(Widget):
         self.registrar = {}
         
     def register(self, tick, tick_index, tick_info):  
-        tick_sc = tick.scale(self.tickline.scale)
+        self._register_all(tick, (tick_index,), (tick_info,))
+        
+    def register_run(self, tick, indices, rects):
+        '''register the labels of a run of ticks of ``tick``, where 
+        ``indices`` and ``rects`` are sequences of what :meth:`register` 
+        takes as ``tick_index`` and ``tick_info``. :class:`Tick` hands all 
+        the ticks of a redraw over this way, saving the overhead of a call 
+        per tick.
+        
+        If :meth:`register` is overriden without overriding this method, 
+        it's called for each tick instead, so labellers written for it keep
+        working.
+        
+        .. versionadded:: 0.2.0
+        '''
+        if not self._registers_each(tick, indices, rects):
+            self._register_all(tick, indices, rects)
+            
+    def _register_all(self, tick, indices, rects):
+        if tick.scale(self.tickline.scale) <= tick.min_label_space:
+            return
+        measure = tick.measure_label
+        place = self.place_label
+        supersedes = self._supersedes
+        registrar = self.registrar
+        scale_factor = tick.scale_factor
+        for tick_index, tick_info in zip(indices, rects):
+            texture = None
+            size = measure(tick_index)
+            if size is None:
+                # the tick can't tell without rendering
+                texture = tick.get_label_texture(tick_index)
+                if not texture:
+                    continue
+                size = texture.size
+            key, pos = place(tick, tick_info, size)
+            if supersedes(key, scale_factor):
+                registrar[key] = (texture, size, tick, tick_index, tick_info,
+                                  pos, scale_factor)
+                
+    def _registers_each(self, tick, indices, rects):
+        '''if :meth:`register` is overriden after :meth:`register_run` or
+        the bulk implementation behind it, call it for each tick and return
+        True.'''
+        if _defining_class(self, 'register') is \
+            _defining_class(self, '_register_all'):
+            return False
+        register = self.register
+        for tick_index, tick_info in zip(indices, rects):
+            register(tick, tick_index, tick_info)
+        return True
+    
+    def place_label(self, tick, tick_info, size):
+        '''compute where the label of a tick should go.
+        
+        Returns a pair ``(key, pos)``, where ``key`` is ``(tick_pos, align)``
+        and identifies the spot the label competes for, and ``pos`` is the
+        position of the lower left corner of the label.
+        
+        :param tick: the :class:`Tick` being labelled.
+        :param tick_info: the rectangle ``(x, y, width, height)`` of the tick.
+        :param size: the ``(width, height)`` of the label.
+        
+        .. versionadded:: 0.2.0
+        '''
         tickline = self.tickline
-        texture = tick.get_label_texture(tick_index)
-        if texture and tick_sc > tick.min_label_space:
-            if tickline.is_vertical():
-                x, tick_pos = (tick_info[0],
-                               tick_info[1] + tick_info[3] / 2)
-                align = tick.halign
-                if align in ('left', 'line_right'):
-                    l_x = x + tick.tick_size[1] + tickline.tick_label_padding
-                else:
-                    l_x = x - texture.width - tickline.tick_label_padding
-                pos = (l_x, tick_pos - texture.height / 2)
+        width, height = size
+        if tickline.is_vertical():
+            x, tick_pos = (tick_info[0],
+                           tick_info[1] + tick_info[3] / 2)
+            align = tick.halign
+            if align in ('left', 'line_right'):
+                l_x = x + tick.tick_size[1] + tickline.tick_label_padding
             else:
-                tick_pos, y = (tick_info[0] + tick_info[2] / 2,
-                               tick_info[1])
-                align = tick.valign
-                if align in ('top', 'line_bottom'):
-                    l_y = y - texture.height - tickline.tick_label_padding
-                else:
-                    l_y = y + tick.tick_size[1] + tickline.tick_label_padding
-                pos = (tick_pos - texture.width / 2, l_y)
-            if (tick_pos, align) not in self.registrar or \
-                self.registrar[(tick_pos, align)][1] > tick.scale_factor:
-                self.registrar[(tick_pos, align)] = (texture, pos,
-                                                     tick.scale_factor)
+                l_x = x - width - tickline.tick_label_padding
+            pos = (l_x, tick_pos - height / 2)
+        else:
+            tick_pos, y = (tick_info[0] + tick_info[2] / 2,
+                           tick_info[1])
+            align = tick.valign
+            if align in ('top', 'line_bottom'):
+                l_y = y - height - tickline.tick_label_padding
+            else:
+                l_y = y + tick.tick_size[1] + tickline.tick_label_padding
+            pos = (tick_pos - width / 2, l_y)
+        return (tick_pos, align), pos
+    
+    def _supersedes(self, key, scale_factor):
+        '''whether a label from a tick with ``scale_factor`` should take the
+        spot ``key``, i.e. whether the spot is free or only taken by a finer
+        tick. Entries of :attr:`registrar` are expected to end with the
+        scale factor of the registering tick.'''
+        registered = self.registrar.get(key)
+        return registered is None or registered[-1] > scale_factor
+    
+    def label_size(self, entry):
+        '''the ``(width, height)`` of the label registered as ``entry`` in
+        :attr:`registrar`. Override along with :meth:`register` if entries 
+        don't hold the size second, or their texture first for entries of
+        three.
+        
+        .. versionadded:: 0.2.0
+        '''
+        if len(entry) == 3:
+            return entry[0].size
+        return entry[1]
+    
+    def label_texture(self, tick, tick_index):
+        '''return the texture of a label kept by :meth:`resolve_collisions`,
+        or None if it shouldn't be drawn by this redraw.
+        
+        .. versionadded:: 0.2.0
+        '''
+        return tick.get_label_texture(tick_index)
+    
+    def resolve_collisions(self):
+        '''remove from :attr:`registrar` the labels overlapping others. 
+        
+        :meth:`register` only lets one label take a given spot; labels of 
+        ticks that nearly coincide may still overlap. Here, labels are 
+        considered from the coarsest tick to the finest, and each is kept
+        only if it doesn't overlap a label already kept. Kept labels are 
+        held in rows, sorted along the tick*line*, whose labels don't 
+        overlap along the line. The labels of a tick are all placed against
+        the line the same way, so they normally fill a single row; a label
+        is checked against the few labels of each row whose extents along 
+        the line overlap its own. This takes O(n r log n) for n labels in 
+        r rows, r being the number of ticks with labels as a rule.
+        
+        Entries of :attr:`registrar` are expected to end with the position
+        of the label and the scale factor of the registering tick.
+        
+        .. versionadded:: 0.2.0
+        '''
+        registrar = self.registrar
+        axis = 1 if self.tickline.is_vertical() else 0
+        # (scale factor, number) -> (starts, ends, across los, across his)
+        rows = {}
+        # coarser ticks first, then along the line
+        for key in sorted(registrar, key=lambda k: (registrar[k][-1], k)):
+            entry = registrar[key]
+            pos = entry[-2]
+            size = self.label_size(entry)
+            start = pos[axis]
+            end = start + size[axis]
+            lo = pos[1 - axis]
+            hi = lo + size[1 - axis]
+            scale_factor = entry[-1]
+            home = None
+            for row_key, (starts, ends, los, his) in rows.items():
+                # the labels of the row overlapping along the line
+                i = bisect(ends, start)
+                j = bisect_left(starts, end, i)
+                if i == j:
+                    if home is None and row_key[0] == scale_factor:
+                        home = row_key
+                    continue
+                if any(los[k] < hi and his[k] > lo for k in range(i, j)):
+                    del registrar[key]
+                    break
+            else:
+                if home is None:
+                    home = scale_factor, \
+                        sum(1 for k in rows if k[0] == scale_factor)
+                    rows[home] = [], [], [], []
+                starts, ends, los, his = rows[home]
+                i = bisect_left(starts, start)
+                starts.insert(i, start)
+                ends.insert(i, end)
+                los.insert(i, lo)
+                his.insert(i, hi)
+    
+    def detach(self):
+        '''remove the labels drawn by this labeller from the canvas of its
+        tickline. Called by the tickline when the labeller is replaced.
+        
+        .. versionadded:: 0.2.0
+        '''
+        self.pool.detach(self.tickline.canvas)
+        
     def make_labels(self):
-        canvas = self.tickline.canvas
-        group_id = self.group_id
-        canvas.remove_group(group_id)
-        with canvas:
-            for texture, pos, _ in self.registrar.values():
-                Rectangle(texture=texture, pos=pos,
-                          size=texture.size,
-                          group=group_id)
+        '''draw the registered labels, reusing the Rectangles of the previous
+        redraw through :attr:`pool`.
+        
+        .. versionchanged:: 0.2.0
+            Rectangles are pooled instead of recreated at every redraw, and
+            overlapping labels are dropped by :meth:`resolve_collisions` 
+            before any texture is obtained. Labels whose size was only
+            estimated are placed again by the size of their texture, and
+            their overlaps resolved again.
+        '''
+        self.resolve_collisions()
+        registrar = self.registrar
+        moved = False
+        for key, entry in list(registrar.items()):
+            if len(entry) == 3 or entry[0] is not None:
+                continue
+            _, size, tick, tick_index, tick_info, pos, scale_factor = entry
+            texture = self.label_texture(tick, tick_index)
+            if not texture:
+                del registrar[key]
+                continue
+            if tuple(texture.size) != tuple(size):
+                # the size was only estimated
+                size = tuple(texture.size)
+                pos = self.place_label(tick, tick_info, size)[1]
+                moved = True
+            registrar[key] = (texture, size, tick, tick_index, tick_info, 
+                              pos, scale_factor)
+        if moved:
+            self.resolve_collisions()
+        labels = [(entry[0], entry[-2], entry[0].size) 
+                  for entry in registrar.values()]
+        self.drawn = labels
+        pool = self.pool
+        pool.attach(self.tickline.canvas)
+        pool.update(labels)
     @property
     def group_id(self):
         return self.__class__.__name__
@@ -296,9 +1121,725 @@ class CompositeLabeller(TickLabeller):
         labeller = self.designater[type(tick)]
         labeller.register(tick, *args, **kw)
         
+    def register_run(self, tick, indices, rects):
+        _register_run(self.designater[type(tick)], tick, indices, rects)
+        
     def make_labels(self):
         for labeller in self.labellers:
             labeller.make_labels()
+            
+    def detach(self):
+        for labeller in self.labellers:
+            detach = getattr(labeller, 'detach', None)
+            if detach is not None:
+                detach()
+        
+class GlyphAtlas(object):
+    '''a texture holding every glyph of an alphabet, rasterized once at a 
+    given font size, along with the location of each glyph in it.
+    
+    The whole alphabet is rendered as a single line of text; each glyph
+    occupies the horizontal slice between the extents of the text preceding
+    it and the text including it. :attr:`glyphs` maps each character to
+    a pair ``(advance, tex_coords)``.
+    
+    Characters outside the alphabet are added on demand through :meth:`add`,
+    which rerenders the atlas.
+    
+    .. versionadded:: 0.2.0
+    '''
+    
+    default_alphabet = u'0123456789.-+e'
+    
+    def __init__(self, font_size, alphabet=None, **kw):
+        self.font_size = font_size
+        self.label_kw = kw
+        self.alphabet = u''
+        self.glyphs = {}
+        self.texture = None
+        self.height = 0
+        self.add(alphabet or self.default_alphabet)
+        
+    def add(self, chars):
+        '''add the characters of ``chars`` missing from the atlas and
+        rerender it. Returns True if the atlas changed.'''
+        glyphs = self.glyphs
+        new = u''.join(sorted(set(c for c in chars if c not in glyphs)))
+        if not new:
+            return False
+        self.alphabet = alphabet = self.alphabet + new
+        label = CoreLabel(text=alphabet, font_size=self.font_size,
+                          **self.label_kw)
+        label.refresh()
+        self.texture = texture = label.texture
+        self.height = height = texture.height
+        extent = label.get_extents
+        x0 = 0
+        for i, c in enumerate(alphabet):
+            x1 = extent(alphabet[:i + 1])[0]
+            glyphs[c] = (x1 - x0,
+                         texture.get_region(x0, 0, x1 - x0, height).tex_coords)
+            x0 = x1
+        return True
+    
+    def measure(self, text):
+        '''return the ``(width, height)`` of ``text`` set in this atlas,
+        adding any missing glyph.'''
+        glyphs = self.glyphs
+        try:
+            return sum(glyphs[c][0] for c in text), self.height
+        except KeyError:
+            self.add(text)
+            return self.measure(text)
+    
+    def quads(self, text, x, y, vertices):
+        '''append to ``vertices`` the quads, in (x, y, u, v) format, that
+        set ``text`` with its lower left corner at ``(x, y)``.'''
+        glyphs = self.glyphs
+        top = y + self.height
+        for c in text:
+            w, (u0, v0, u1, v1, u2, v2, u3, v3) = glyphs[c]
+            vertices.extend((x, y, u0, v0,
+                             x + w, y, u1, v1,
+                             x + w, top, u2, v2,
+                             x, top, u3, v3))
+            x += w
+            
+class AtlasLabeller(TickLabeller):
+    '''a :class:`TickLabeller` that composes labels out of glyphs from a 
+    :class:`GlyphAtlas` instead of rasterizing each label on its own.
+    
+    Every glyph is rasterized once per font size, and all the labels of 
+    a redraw are emitted as quads in a single Mesh per font size, in place
+    of one texture and one Rectangle per label. This pays off when hundreds 
+    of numeric labels are on screen.
+    
+    The text of a label is obtained from :meth:`Tick.get_label_text`, and
+    its font size from :meth:`Tick.label_options`, so ticks overriding 
+    :meth:`Tick.get_label_texture` to produce custom textures should be 
+    labelled by a :class:`TickLabeller` instead, possibly alongside this 
+    one through a :class:`CompositeLabeller`.
+    
+    :param alphabet: characters prerendered into every atlas. Others are
+        added as they are met.
+    :param kw: other keyword arguments are passed to Label when rendering
+        an atlas.
+    
+    .. versionadded:: 0.2.0
+    '''
+    
+    def __init__(self, tickline, alphabet=None, **kw):
+        super(AtlasLabeller, self).__init__(tickline)
+        self.alphabet = alphabet
+        self.label_kw = kw
+        self.atlases = {}
+        self.instr = InstructionGroup(group=self.group_id)
+        self._meshes = {}
+        
+    def get_atlas(self, font_size):
+        '''return the :class:`GlyphAtlas` for ``font_size``, creating
+        it if necessary.'''
+        try:
+            return self.atlases[font_size]
+        except KeyError:
+            atlas = self.atlases[font_size] = \
+                    GlyphAtlas(font_size, self.alphabet, **self.label_kw)
+            return atlas
+        
+    def register(self, tick, tick_index, tick_info):
+        self._register_all(tick, (tick_index,), (tick_info,))
+        
+    def _register_all(self, tick, indices, rects):
+        if tick.scale(self.tickline.scale) <= tick.min_label_space:
+            return
+        get_text = tick.get_label_text
+        font_size = tick.label_options().get('font_size', 
+                                             tick.tick_size[1] * 2)
+        atlas = self.get_atlas(font_size)
+        place = self.place_label
+        supersedes = self._supersedes
+        registrar = self.registrar
+        scale_factor = tick.scale_factor
+        for tick_index, tick_info in zip(indices, rects):
+            text = get_text(tick_index)
+            if not text:
+                continue
+            key, pos = place(tick, tick_info, atlas.measure(text))
+            if supersedes(key, scale_factor):
+                registrar[key] = (atlas, text, pos, scale_factor)
+            
+    def label_size(self, entry):
+        atlas, text = entry[:2]
+        return atlas.measure(text)
+    
+    def detach(self):
+        super(AtlasLabeller, self).detach()
+        canvas = self.tickline.canvas
+        if canvas.indexof(self.instr) >= 0:
+            canvas.remove(self.instr)
+            
+    def make_labels(self):
+        self.resolve_collisions()
+        canvas = self.tickline.canvas
+        instr = self.instr
+        if canvas.indexof(instr) < 0:
+            canvas.add(instr)
+        batches = dict((atlas, []) for atlas in self.atlases.values())
+        for atlas, text, pos, _ in self.registrar.values():
+            atlas.quads(text, pos[0], pos[1], batches[atlas])
+        meshes = self._meshes
+        for atlas, vertices in batches.items():
+            try:
+                mesh = meshes[atlas]
+            except KeyError:
+                mesh = meshes[atlas] = Mesh(mode='triangles')
+                instr.add(mesh)
+            if not vertices:
+                # kivy can't take empty buffers
+                mesh.vertices = []
+                mesh.indices = []
+                continue
+            mesh.texture = atlas.texture
+            mesh.vertices = vertices
+            mesh.indices = _quad_indices(len(vertices) // 16)
+            
+class _PixelSink(object):
+    '''stands for the texture of a Label rendered by :func:`rasterize_label`,
+    keeping the pixels blitted to it.'''
+    
+    data = None
+    
+    def blit_data(self, data):
+        self.data = data
+        
+def rasterize_label(text, **kw):
+    '''render ``text`` with Label keyword args ``kw`` into an ImageData, 
+    without creating a texture, so that it can run outside of the main 
+    thread. Returns None if nothing is drawn.
+    
+    .. versionadded:: 0.2.0
+    '''
+    label = CoreLabel(text=text, **kw)
+    label.resolve_font_name()
+    # what Label.refresh does, up to the texture
+    size = label.render()
+    if size[0] <= 1 or size[1] <= 1:
+        return None
+    label._size_texture = label._size = size
+    label.texture = sink = _PixelSink()
+    label.render(real=True)
+    return sink.data
+
+_estimated_label_sizes = {}
+
+def _estimate_label_size(text, kw):
+    '''the size of the label of ``text`` with Label keyword args ``kw``, 
+    laid out but not rasterized, as measured for the first text of the same
+    length and options.'''
+    key = (len(text), _options_key(kw))
+    try:
+        return _estimated_label_sizes[key]
+    except KeyError:
+        label = CoreLabel(text=text, **kw)
+        label.resolve_font_name()
+        size = _estimated_label_sizes[key] = tuple(label.render())
+        return size
+
+class AsyncLabeller(TickLabeller):
+    '''a :class:`TickLabeller` that rasterizes label text in worker threads,
+    so that a redraw bringing many new labels into view doesn't block the
+    frame.
+    
+    A label whose texture is not in the :attr:`~Tick.label_cache` of its
+    tick is not drawn by that redraw; its text is instead handed to 
+    :attr:`executor`, which renders it into pixels with 
+    :func:`rasterize_label`. Back on the main thread, at most 
+    :attr:`max_uploads` of the finished labels are turned into textures 
+    and put in the cache per frame, after which the tickline redraws to 
+    show them. Only labels left after :meth:`~TickLabeller.resolve_collisions`
+    are requested, and requests still pending for labels that went out of 
+    view by the next redraw are dropped.
+    
+    Ticks overriding :meth:`~Tick.get_label_texture` or 
+    :meth:`~Tick.render_label` are labelled synchronously, as by 
+    :class:`TickLabeller`. So are ticks whose :attr:`~Tick.label_cache` is
+    None, unless ``cache`` is given.
+    
+    :param max_workers: the number of worker threads. Kivy's SDL2 text 
+        provider isn't documented as thread safe, so more than one worker
+        should only be used with a provider that is, such as PIL.
+    :param max_uploads: the maximal number of textures created per frame.
+    :param cache: the :class:`LabelTextureCache` holding the textures of
+        the ticks without one.
+    
+    The worker threads are shut down when the labeller is replaced on its
+    tickline.
+    
+    Requires ``concurrent.futures``.
+    
+    .. versionadded:: 0.2.0
+    '''
+    
+    def __init__(self, tickline, max_workers=1, max_uploads=8, cache=None,
+                 **kw):
+        if ThreadPoolExecutor is None:
+            raise ImportError('AsyncLabeller requires concurrent.futures')
+        super(AsyncLabeller, self).__init__(tickline, **kw)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.max_uploads = max_uploads
+        self.cache = cache
+        self._pending = {}
+        self._requested = set()
+        self._done = deque()
+        self._trigger_upload = Clock.create_trigger(self._upload, 0)
+        
+    def re_init(self, *args):
+        super(AsyncLabeller, self).re_init(*args)
+        self._requested = set()
+        
+    def label_texture(self, tick, tick_index):
+        cache = tick.label_cache
+        if cache is None:
+            cache = self.cache
+        if cache is None or \
+            _defining_class(tick, 'get_label_texture') is not Tick or \
+            _defining_class(tick, 'render_label') is not Tick:
+            return super(AsyncLabeller, self).label_texture(tick, tick_index)
+        text = tick.get_label_text(tick_index)
+        if not text:
+            return None
+        kw = tick.label_options()
+        key = tick.label_cache_key(text, kw)
+        if key in self._pending:
+            self._requested.add(key)
+            return None
+        texture = cache.get(key)
+        if texture is None:
+            self._request(key, cache, text, kw)
+        return texture
+            
+    def make_labels(self):
+        super(AsyncLabeller, self).make_labels()
+        # drop the requests that weren't renewed, if not yet started
+        pending = self._pending
+        requested = self._requested
+        for key in [k for k in pending if k not in requested]:
+            if pending[key].cancel():
+                del pending[key]
+                
+    def detach(self):
+        '''take the labels off the canvas, drop the pending requests and
+        :meth:`shutdown` the worker threads.'''
+        super(AsyncLabeller, self).detach()
+        self._trigger_upload.cancel()
+        for future in self._pending.values():
+            future.cancel()
+        self._pending = {}
+        self._done.clear()
+        self.shutdown()
+        
+    def shutdown(self, wait=False):
+        '''stop the worker threads once the current requests are done.'''
+        self.executor.shutdown(wait=wait)
+        
+    def _request(self, key, cache, text, kw):
+        self._requested.add(key)
+        self._pending[key] = self.executor.submit(self._rasterize, key, 
+                                                  cache, text, kw)
+        
+    def _rasterize(self, key, cache, text, kw):
+        # runs in a worker thread
+        try:
+            data = rasterize_label(text, **kw)
+        except Exception:
+            Logger.exception('Tickline: failed to rasterize %r' % text)
+            data = None
+        self._done.append((key, cache, data))
+        self._trigger_upload()
+        
+    def _upload(self, *args):
+        done = self._done
+        pending = self._pending
+        uploaded = 0
+        while done and uploaded < self.max_uploads:
+            key, cache, data = done.popleft()
+            if pending.pop(key, None) is None:
+                continue
+            if data is None:
+                texture = Texture.create(size=(1, 1), colorfmt='rgba')
+                texture.blit_buffer(b'\x00' * 4, colorfmt='rgba', 
+                                    bufferfmt='ubyte')
+            else:
+                texture = Texture.create(size=(data.width, data.height),
+                                         colorfmt=data.fmt)
+                texture.blit_data(data)
+                texture.flip_vertical()
+            cache.put(key, texture)
+            uploaded += 1
+        if done:
+            self._trigger_upload()
+        if uploaded:
+            self.tickline.redraw()
+    
+class LabelPrefetcher(object):
+    '''renders, while ``tickline`` is in motion, the labels of the ticks
+    about to come into view, so that they're in the 
+    :class:`LabelTextureCache` of their ticks by the time they're drawn.
+    
+    The view is predicted to move at the velocity of the 
+    :attr:`~Tickline.scroll_effect` or, while it's dragged, at the rate it
+    moved over the last frame, for :attr:`lookahead` seconds. The labels
+    between the edge of the view, extended as by :attr:`Tickline.overscan`,
+    and that predicted edge are rendered nearest first, for at most 
+    :attr:`budget` seconds per frame. Labels still to render are dropped as 
+    soon as the motion reverses or stops.
+    
+    Only ticks whose labels are shown at the current scale, that have a
+    :attr:`~Tick.label_cache`, that don't override 
+    :meth:`~Tick.get_label_texture` and whose :meth:`~Tick.label_indices`
+    isn't None are prefetched.
+    
+    :param tickline: the :class:`Tickline` to prefetch labels for.
+    :param lookahead: how far ahead to prefetch, in seconds of motion.
+    :param budget: the time spent prefetching per frame, in seconds.
+    :param max_labels: the maximal number of labels prefetched per tick
+        for a given prediction.
+    
+    :attr:`prefetched` counts the labels rendered. The prefetcher lasts as
+    long as ``tickline``, or until :meth:`detach`.
+        
+    .. versionadded:: 0.2.0
+    '''
+    
+    def __init__(self, tickline, lookahead=.5, budget=.002, max_labels=256):
+        self.tickline = tickline
+        self.lookahead = lookahead
+        self.budget = budget
+        self.max_labels = max_labels
+        self.prefetched = 0
+        self._queue = None
+        self._plan = None
+        self._last_mid = None
+        self._stepping = False
+        # the tickline keeps the prefetcher alive, through the triggers 
+        # it's bound to
+        self._trigger_motion = Clock.create_trigger(self._on_in_motion, -1,
+                                                    release_ref=False)
+        self._step_event = Clock.create_trigger(self.step, 0, interval=True,
+                                                release_ref=False)
+        tickline.bind(in_motion=self._trigger_motion)
+        self._on_in_motion()
+        
+    def detach(self):
+        '''stop prefetching for the tickline.'''
+        self.tickline.unbind(in_motion=self._trigger_motion)
+        self._trigger_motion.cancel()
+        self._stop()
+        
+    def target_range(self, velocity):
+        '''return ``(lo, hi)``, the global indices about to come into view 
+        when moving at ``velocity``, or None. The range starts at the edge
+        of the view extended by :meth:`Tickline.overscan_margin`, since the 
+        ticks up to there are drawn already.'''
+        tickline = self.tickline
+        extended = tickline._extended_range()
+        if not velocity or extended is None:
+            return None
+        margin = tickline.overscan_margin()
+        lo, hi = extended[0] - margin, extended[1] + margin
+        distance = velocity * self.lookahead
+        if distance > 0:
+            return hi, hi + distance
+        return lo + distance, lo
+    
+    def step(self, dt):
+        '''prefetch labels for at most :attr:`budget` seconds.'''
+        tickline = self.tickline
+        mid = tickline.index_mid
+        velocity = tickline.scroll_effect.velocity
+        if not velocity and self._last_mid is not None and dt > 0:
+            velocity = (mid - self._last_mid) / dt
+        self._last_mid = mid
+        target = self.target_range(velocity)
+        if target is None:
+            self._queue = self._plan = None
+            return
+        direction = 1 if velocity > 0 else -1
+        plan = self._plan
+        if plan is None or plan[0] != direction or \
+            (target[1] > plan[2] if direction > 0 else target[0] < plan[1]):
+            # the motion reversed or outran the labels planned
+            self._plan = (direction,) + target
+            self._queue = self._labels(target, direction < 0)
+        self._render(self._queue)
+        
+    def _labels(self, target, reverse):
+        '''the ticks and indices to label in ``target``, nearest first.'''
+        tickline = self.tickline
+        scale = tickline.scale
+        lo, hi = target
+        labels = []
+        for tick in tickline.ticks:
+            tick_sc = tick.scale(scale)
+            if tick_sc < tick.min_space or tick_sc <= tick.min_label_space or \
+                tick.label_cache is None or \
+                _defining_class(tick, 'get_label_texture') is not Tick:
+                continue
+            indices = tick.label_indices(tickline, lo, hi, reverse)
+            if indices is None:
+                continue
+            for n, index in enumerate(indices):
+                if n == self.max_labels:
+                    break
+                labels.append((tick.globalize(index), n, tick, index))
+        labels.sort(key=lambda label: label[:2], reverse=reverse)
+        return iter([label[2:] for label in labels])
+                
+    def _render(self, queue):
+        deadline = default_timer() + self.budget
+        for tick, index in queue:
+            text = tick.get_label_text(index)
+            if not text:
+                continue
+            kw = tick.label_options()
+            key = tick.label_cache_key(text, kw)
+            cache = tick.label_cache
+            if key in cache:
+                continue
+            cache.put(key, tick.render_label(text, **kw))
+            self.prefetched += 1
+            if default_timer() > deadline:
+                return
+            
+    def _on_in_motion(self, *args):
+        if self.tickline.in_motion:
+            if not self._stepping:
+                self._stepping = True
+                self._last_mid = None
+                self._step_event()
+        else:
+            self._stop()
+            
+    def _stop(self):
+        self._step_event.cancel()
+        self._stepping = False
+        self._queue = self._plan = self._last_mid = None
+        
+_twin_settings = ('scale_factor', 'offset', 'label_global', 'tick_size',
+                  'label_cache')
+
+class TicklineLink(object):
+    '''makes several :class:`Tickline`\ s pan and zoom together, such as a 
+    time ruler stacked over event tracks.
+    
+    The ``driver`` is the tickline that takes the touches and runs the 
+    scroll effect; whenever its view changes, every follower is given the
+    same :attr:`~Tickline.index_0` and :attr:`~Tickline.index_1`, along
+    with :attr:`~Tickline.in_motion`, once per frame by :meth:`sync`, 
+    however many times the view of the driver changed in that frame. 
+    Followers should extend along the same span as the driver, and not be
+    panned on their own: their view is overwritten at the next sync. The
+    touches on a follower that its children don't take are handed over to
+    the driver, so that panning or zooming any tickline of the link moves 
+    them all. The link lasts as long as the driver, or until 
+    :meth:`unlink`.
+    
+    A :class:`Tick` of a follower that has the same class and settings as
+    a tick of the driver, and draws through the default methods of 
+    :class:`Tick`, is its *twin*: instead of being computed again, its 
+    ticks are copied from those the driver tick just drew, moved across the
+    line, and, unless :meth:`~Tick.render_label` is overriden, its label 
+    textures are cached under the same :attr:`~Tick.label_owner`, so that
+    each label is rasterized once for the whole link. Ticks are paired 
+    again whenever the ticks of a tickline of the link, or the settings 
+    compared, change. Copying ticks requires numpy.
+    
+    :param driver: the :class:`Tickline` driving the others.
+    :param followers: the :class:`Tickline`\ s to follow it.
+    
+    .. versionadded:: 0.2.0
+    '''
+    
+    def __init__(self, driver, followers=()):
+        self.driver = driver
+        self.followers = []
+        self._watched = []
+        # the driver keeps the link alive, through the trigger it's bound to
+        self._trigger_sync = Clock.create_trigger(self.sync, -1, 
+                                                  release_ref=False)
+        driver.bind(index_0=self._trigger_sync, index_1=self._trigger_sync,
+                    in_motion=self._trigger_sync, ticks=self._pair)
+        for follower in followers:
+            self.add(follower)
+            
+    def add(self, follower):
+        '''make ``follower`` follow the driver.'''
+        if follower in self.followers or follower is self.driver:
+            return
+        self.followers.append(follower)
+        follower.bind(ticks=self._pair, on_touch_down=self._hand_over)
+        # the driver scrolls for it from now on
+        effect = follower.scroll_effect
+        effect.velocity = 0
+        effect.cancel()
+        self._pair()
+        self.sync()
+        
+    def remove(self, follower):
+        '''stop ``follower`` from following the driver.'''
+        self.followers.remove(follower)
+        follower.unbind(ticks=self._pair, on_touch_down=self._hand_over)
+        self._unpair(follower)
+        self._pair()
+        
+    def unlink(self):
+        '''remove all the followers and stop following the driver.'''
+        for follower in self.followers[:]:
+            self.remove(follower)
+        self.driver.unbind(index_0=self._trigger_sync, 
+                           index_1=self._trigger_sync,
+                           in_motion=self._trigger_sync, ticks=self._pair)
+        self._watch([])
+        self._trigger_sync.cancel()
+        
+    def sync(self, *args):
+        '''give the view of the driver to the followers.'''
+        driver = self.driver
+        index_0, index_1 = driver.index_0, driver.index_1
+        in_motion = driver.in_motion
+        for follower in self.followers:
+            if follower.index_0 != index_0 or follower.index_1 != index_1:
+                follower.index_0 = index_0
+                follower.index_1 = index_1
+            follower.in_motion = in_motion
+            
+    def _hand_over(self, follower, touch):
+        # as Tickline.on_touch_down, but the driver takes the touch, in its
+        # own coordinates
+        if not follower.collide_point(*touch.pos):
+            return False
+        if Widget.on_touch_down(follower, touch):
+            return True
+        driver = self.driver
+        touch.push()
+        touch.apply_transform_2d(
+            lambda x, y: driver.to_widget(*follower.to_window(x, y)))
+        try:
+            driver._take_touch(touch)
+        finally:
+            touch.pop()
+        return True
+    
+    def _watch(self, ticks):
+        '''pair the ticks again when a setting of ``ticks`` compared by 
+        :meth:`_find_twin` changes.'''
+        names = dict((name, self._pair) for name in _twin_settings)
+        for tick in self._watched:
+            tick.unbind(**names)
+        for tick in ticks:
+            tick.bind(**names)
+        self._watched = list(ticks)
+        
+    def _pair(self, *args):
+        driver_ticks = self.driver.ticks
+        self._watch(driver_ticks + 
+                    [tick for follower in self.followers 
+                     for tick in follower.ticks])
+        for tick in driver_ticks:
+            tick._keep_layout = False
+            tick._layout = None
+        for follower in self.followers:
+            for tick in follower.ticks:
+                source = self._find_twin(tick, driver_ticks)
+                tick._layout_source = source
+                tick.label_owner = None
+                if source is None:
+                    continue
+                source._keep_layout = True
+                if _defining_class(tick, 'render_label') is Tick:
+                    # textures only depend on their text and options
+                    tick.label_owner = source.uid
+                    
+    def _unpair(self, follower):
+        for tick in follower.ticks:
+            tick._layout_source = None
+            tick.label_owner = None
+    
+    @staticmethod
+    def _find_twin(tick, candidates):
+        if not tick._can_share_layout():
+            return None
+        for other in candidates:
+            if type(other) is type(tick) and \
+                other.scale_factor == tick.scale_factor and \
+                other.offset == tick.offset and \
+                other.label_global == tick.label_global and \
+                list(other.tick_size) == list(tick.tick_size) and \
+                other.label_cache is tick.label_cache:
+                return other
+        return None
+        
+class GeometryRegistry(object):
+    '''holds the geometry computed by the redraws of the :class:`Tickline`\ s
+    given it as :attr:`~Tickline.geometry_registry`, so that ticklines with 
+    the same ticks, size and view, such as the rows of a list, compute it 
+    once between them.
+    
+    The geometry of a redraw is the vertices of every tick and the labels 
+    drawn, along with the position of the tickline that computed it. 
+    Entries are keyed by everything else the geometry depends on, and are 
+    reference counted: each tickline holds the entry of its last redraw, 
+    until it's removed from its parent or garbage collected, and an entry
+    is dropped once no tickline holds it.
+    
+    .. versionadded:: 0.2.0
+    '''
+    
+    def __init__(self):
+        self._entries = {}
+        # weak references to the holders -> the key of the entry they hold
+        self._holders = {}
+        
+    def __len__(self):
+        return len(self._entries)
+    
+    def acquire(self, key, holder=None):
+        '''return the entry for ``key``, adding an empty one if there's 
+        none, and count a reference to it. If ``holder`` is given, the 
+        reference is dropped once ``holder`` is garbage collected, unless 
+        it's released before.'''
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _SharedGeometry()
+        entry.refs += 1
+        if holder is not None:
+            self._holders[ref(holder, self._collected)] = key
+        return entry
+    
+    def release(self, key, holder=None):
+        '''drop a reference to the entry for ``key``, acquired by 
+        ``holder`` if given.'''
+        if holder is not None:
+            self._holders.pop(ref(holder), None)
+        entry = self._entries[key]
+        entry.refs -= 1
+        if not entry.refs:
+            del self._entries[key]
+            
+    def _collected(self, holder_ref):
+        key = self._holders.pop(holder_ref, None)
+        if key is not None:
+            self.release(key)
+            
+class _SharedGeometry(object):
+    '''an entry of a :class:`GeometryRegistry`. :attr:`vertices` is None 
+    until a redraw computes it.'''
+    
+    def __init__(self):
+        self.refs = 0
+        self.origin = None
+        self.vertices = None
+        self.labels = None
         
 class Tickline(StencilView):
     '''See module documentation for details.'''
@@ -530,7 +2071,117 @@ class Tickline(StencilView):
     redraw = ObjectProperty(None)
     '''a trigger to redraw graphics. In most cases this is not necessary
     to call publicly as it is already bound to relevant properties.
-    The actual redrawing is done by :meth:`redraw_`.'''
+    The actual redrawing is done by :meth:`redraw_`.
+    
+    .. versionchanged:: 0.2.0
+        Calling this always schedules a full redraw, even if 
+        :attr:`translate_on_pan` is True.'''
+    
+    translate_on_pan = BooleanProperty(False)
+    '''if True, a pure translation of the tickline (a change of
+    :attr:`index_0` and :attr:`index_1` leaving :attr:`scale` unchanged) 
+    doesn't recompute the ticks and labels, but only shifts the existing
+    graphics with a Translate instruction. Ticks and labels are computed anew
+    only when ticks would enter the view, or when anything else changes.
+    
+    This relies on :meth:`Tick.pan_range` to know how far each tick can be
+    translated. Ticks returning None from it force a full redraw on every
+    translation. Labellers are expected to draw inside :attr:`canvas`, 
+    which is translated along with the ticks.
+    
+    .. versionadded:: 0.2.0
+    '''
+    
+    overscan = NumericProperty(0)
+    '''fraction of :attr:`line_length` by which ticks and labels are 
+    generated beyond each end of the view. 
+    
+    Together with :attr:`translate_on_pan`, this lets the tickline be panned
+    over that margin by only translating the graphics: ticks and labels are
+    recomputed a few times per second instead of at every frame, at the cost
+    of drawing up to ``1 + 2 * overscan`` times as many of them. Without
+    :attr:`translate_on_pan`, it only adds work.
+    
+    .. versionadded:: 0.2.0
+    '''
+    
+    motion_labels = BooleanProperty(True)
+    '''if False, no label is registered by the redraws happening while 
+    :attr:`in_motion`, which leave the view unlabelled.
+    
+    This and :attr:`motion_hidden_levels` and :attr:`motion_max_ticks` trade
+    the fidelity of the frames drawn during scrolls and flings for their
+    cost. Once the motion stops, the tickline is redrawn at full quality.
+    
+    .. versionadded:: 0.2.0
+    '''
+    
+    motion_hidden_levels = BoundedNumericProperty(0, min=0)
+    '''the number of the finest sets of ticks shown that are not drawn by 
+    the redraws happening while :attr:`in_motion`. See 
+    :attr:`motion_labels`.
+    
+    Ticks overriding :meth:`~Tick.display` are always drawn.
+    
+    .. versionadded:: 0.2.0
+    '''
+    
+    motion_max_ticks = NumericProperty(None, allownone=True)
+    '''if not None, the sets of ticks that would draw more ticks than this,
+    as estimated by :meth:`Tick.count_ticks`, are not drawn by the redraws
+    happening while :attr:`in_motion`. See :attr:`motion_labels`.
+    
+    .. versionadded:: 0.2.0
+    '''
+    
+    profiler = ObjectProperty(None, allownone=True)
+    '''a :class:`RedrawProfiler` timing the phases of every redraw and
+    counting what they produce, or None, the default, not to instrument
+    redraws. Set it to ``RedrawProfiler()`` to find out which tick or which
+    labeller makes a frame slow.
+    
+    .. versionadded:: 0.2.0
+    '''
+    
+    redraw_stats = ObjectProperty(None, allownone=True)
+    '''the record of the last redraw by :attr:`profiler` (see
+    :class:`RedrawProfiler`). A new dict is set after each instrumented 
+    redraw, so binding to this property reports every redraw.
+    
+    .. versionadded:: 0.2.0
+    '''
+    
+    batch_ticks = BooleanProperty(False)
+    '''if True, the ticks are drawn together by a single Mesh, with their
+    colors held in a palette texture (see :class:`TickBatch`), instead of
+    with a Color and a Mesh each. The number of draw calls then no longer
+    grows with the number of ticks.
+    
+    Ticks whose :attr:`~Tick.batchable` is False, or that override 
+    :meth:`~Tick.display`, :meth:`~Tick.draw` or :meth:`~Tick.draw_tick`,
+    are still drawn on their own, since they may draw more than quads. All 
+    the batched ticks are drawn where the last of them would be.
+    
+    .. versionadded:: 0.2.0
+    '''
+    
+    geometry_registry = ObjectProperty(None, allownone=True)
+    '''a :class:`GeometryRegistry` shared with other ticklines likely to
+    show the same ticks at the same size and view, such as the rows of a 
+    list. A redraw first looks up the geometry computed for the same 
+    settings of :attr:`ticks`, :attr:`size`, :attr:`orientation`, 
+    :attr:`backward`, index range, :attr:`overscan`, :attr:`line_offset` 
+    and :attr:`tick_label_padding`; if some other tickline computed it, it's
+    shown, translated to the position of this one, instead of being 
+    computed again.
+    
+    Only used when every tick draws and labels through the default methods
+    of :class:`Tick`, as :class:`Tick` and :class:`LabellessTick` do, and 
+    isn't linked by a :class:`TicklineLink`, the :attr:`labeller` is a 
+    :class:`TickLabeller` and :attr:`batch_ticks` is False.
+    
+    .. versionadded:: 0.2.0
+    '''
     #===========================================================================
     # private attributes
     #===========================================================================
@@ -538,8 +2189,10 @@ class Tickline(StencilView):
     scale_tolerances = ListProperty()
     '''essentially::
     
-        sorted([(tick.scale_factor * tick.min_space, tick) for tick in self.ticks])
+        sorted([(tick.scale_factor * tick.min_space, tick) for tick in self.ticks],
+               key=lambda pair: pair[0])
         
+    Ticks with the same tolerance keep their order in :attr:`ticks`. 
     This is used to determine :attr:`densest_tick`'''
     
     line_instr = ObjectProperty(None)
@@ -559,22 +2212,39 @@ class Tickline(StencilView):
     def __init__(self, *args, **kw):
         self._trigger_calibrate = \
                     Clock.create_trigger(self.calibrate_scroll_effect, -1)
+        self._trigger_update = _trigger_update = \
+                                Clock.create_trigger(self._update_graphics, -1)
         self.redraw = _redraw_trigger = \
-                                Clock.create_trigger(self.redraw_, -1)
+                                Clock.create_trigger(self._redraw_all, -1)
+        self._pan_bounds = None
+        self._batch = TickBatch()
+        self._degraded = False
+        self._shared = None
+        self._geometry_offset = (0, 0)
+        self._labeller = None
         super(Tickline, self).__init__(*args, **kw)
         self._touches = []
         self._last_touch_pos = {}
         self.scroll_effect = self.scroll_effect_cls()
         self.on_scroll_effect_cls()
-        self.bind(index_0=_redraw_trigger,
-                  index_1=_redraw_trigger,
+        self.bind(index_0=_trigger_update,
+                  index_1=_trigger_update,
                   pos=_redraw_trigger,
                   size=_redraw_trigger,
                   orientation=_redraw_trigger,
-                  ticks=_redraw_trigger)
+                  ticks=_redraw_trigger,
+                  line_offset=_redraw_trigger,
+                  tick_label_padding=_redraw_trigger,
+                  labeller=_redraw_trigger,
+                  translate_on_pan=_redraw_trigger,
+                  overscan=_redraw_trigger,
+                  geometry_registry=_redraw_trigger,
+                  batch_ticks=self.on_ticks,
+                  in_motion=self._on_in_motion)
         self.bind(index_mid=self._trigger_calibrate)
         self.init_center_line_instruction()
         self.init_background_instruction()
+        self.init_translate_instruction()
         self.on_ticks()
         self._update_densest_tick()
         self.labeller = self.labeller_cls(self, **self.labeller_args)
@@ -582,7 +2252,7 @@ class Tickline(StencilView):
     def on_scale(self, *args):
         self._update_densest_tick()
         self._update_effect_constants()
-        self.redraw()
+        self._trigger_update()
         
     def on_backward(self, *args):
         if self.index_0 < self.index_1 and self.backward:
@@ -592,18 +2262,39 @@ class Tickline(StencilView):
         self._update_tolerances()
         for tick in self.ticks:
             tick.bind(scale_factor=self._update_tolerances,
-                      min_space=self._update_tolerances)
+                      min_space=self._update_tolerances,
+                      on_data_changed=self._on_tick_data_changed,
+                      batchable=self.on_ticks)
+        batch = self._batch
+        batch.set_ticks(tick for tick in self.ticks 
+                        if self.batch_ticks and tick.can_batch())
         canvas = self.canvas
         if not canvas:
             return
-        canvas.clear()
-        canvas.add(self.background_instr)
+        # background and line sit in canvas.before, outside the translation
+        underlay = self.underlay_instr
+        underlay.clear()
+        underlay.add(self.background_instr)
         if self.draw_line:
-            canvas.add(self.line_color_instr)
-            canvas.add(self.line_instr)
+            underlay.add(self.line_color_instr)
+            underlay.add(self.line_instr)
+        canvas.clear()
         for tick in self.ticks:
-            canvas.add(tick.instr)           
+            if tick not in batch:
+                canvas.add(tick.instr)
+            elif tick is batch.ticks[-1]:
+                canvas.add(batch.instr)
+        self.redraw()
     
+    def on_labeller(self, *args):
+        # take the labels of the replaced labeller off the canvas
+        previous = self._labeller
+        if previous is not None and previous is not self.labeller:
+            detach = getattr(previous, 'detach', None)
+            if detach is not None:
+                detach()
+        self._labeller = self.labeller
+        
     def on_labeller_cls(self, *args):        
         self.labeller = self.labeller_cls(self, **self.labeller_args)
         
@@ -622,6 +2313,11 @@ class Tickline(StencilView):
         self.redraw()
         self._trigger_calibrate()
         
+    def on_parent(self, *args):
+        # a tickline taken off the screen no longer needs its shared geometry
+        if self.parent is None:
+            self._release_geometry()
+        
     def on_max_index(self, *args):
         try:
             self._trigger_calibrate()
@@ -713,6 +2409,38 @@ class Tickline(StencilView):
     
     def is_vertical(self):
         return self.orientation == 'vertical'
+    
+    def overscan_margin(self):
+        '''the margin, in global indices, by which ticks are generated beyond
+        each end of the view, as given by :attr:`overscan`.
+        
+        .. versionadded:: 0.2.0
+        '''
+        scale = abs(self.scale)
+        if not self.overscan or not scale:
+            return 0
+        return self.overscan * self.line_length / scale
+    
+    def redraw_range(self, index_lo, index_hi):
+        '''notify that the ticks between the global indices ``index_lo`` and
+        ``index_hi`` changed. Redraws if they are in the extended range of
+        the view; otherwise only makes sure a later pan over them redraws
+        rather than translate the current graphics (see 
+        :attr:`translate_on_pan`).
+        
+        .. versionadded:: 0.2.0
+        '''
+        if index_lo > index_hi:
+            index_lo, index_hi = index_hi, index_lo
+        extended = self._extended_range()
+        if extended is None or \
+            index_lo <= extended[1] and index_hi >= extended[0]:
+            self.redraw()
+        elif self._pan_bounds is not None:
+            lo, hi = self._pan_bounds
+            if index_lo < hi and index_hi > lo:
+                self._pan_bounds = None
+    
     def init_center_line_instruction(self):
         if not self.draw_line:
             self.line_color_instr = self.line_instr = None
@@ -751,20 +2479,249 @@ class Tickline(StencilView):
         update = self._update_background
         self.bind(background_color=update, pos=update, size=update,
                   background_image=update)
+    def init_translate_instruction(self):
+        '''set up the instructions translating the content of :attr:`canvas`
+        when :attr:`translate_on_pan`. The background and the tick*line*
+        are drawn in ``canvas.before``, ahead of the translation, and child
+        widgets in ``canvas.after``, past it.
+        
+        .. versionadded:: 0.2.0
+        '''
+        self.underlay_instr = InstructionGroup()
+        self.translate_instr = Translate()
+        before = self.canvas.before
+        before.add(self.underlay_instr)
+        before.add(PushMatrix())
+        before.add(self.translate_instr)
+        self.canvas.after.insert(0, PopMatrix())
+        
+    def add_widget(self, widget, *args, **kw):
+        super(Tickline, self).add_widget(widget, *args, **kw)
+        # keep children out of the translation, but within the stencil
+        canvas = self.canvas
+        if canvas.indexof(widget.canvas) < 0:
+            return
+        canvas.remove(widget.canvas)
+        after = canvas.after
+        # in drawing order, as they were in canvas
+        children = [child for child in reversed(self.children) 
+                    if child is widget or after.indexof(child.canvas) >= 0]
+        for child in children:
+            if child is not widget:
+                after.remove(child.canvas)
+        for i, child in enumerate(children):
+            after.insert(1 + i, child.canvas)
+        
     def redraw_(self, *args):
-        self.labeller.re_init()
-        # draw ticks
-        for tick in self.ticks:
-            tick.display(self)
-        # update labels
-        self.labeller.make_labels()
+        profiler = self.profiler
+        if profiler is None:
+            self._redraw(None)
+            return
+        profiler.begin(self)
+        try:
+            self._redraw(profiler)
+        finally:
+            self.redraw_stats = profiler.end()
     #===========================================================================
     # prive methods
     #===========================================================================
+    def _redraw(self, profiler):
+        labeller = self.labeller
+        labeller.re_init()
+        if profiler is not None:
+            profiler.mark('re_init')
+        hidden = self._motion_hidden_ticks()
+        skip_labels = self.in_motion and not self.motion_labels
+        self._degraded = bool(hidden) or skip_labels
+        shared = self._acquire_geometry(hidden, skip_labels)
+        if shared is not None and shared.vertices is not None:
+            self._apply_geometry(shared)
+            if profiler is not None:
+                profiler.mark('shared_geometry')
+            self._record_pan_bounds()
+            return
+        self._geometry_offset = (0, 0)
+        self._reset_translation()
+        if skip_labels:
+            restore_register = _override(labeller, 'register', 
+                                         _skip_register)
+            restore_register_run = _override(labeller, 'register_run', 
+                                             _skip_register)
+        try:
+            # draw ticks
+            batch = self._batch
+            batch.reset()
+            for i, tick in enumerate(self.ticks):
+                if tick in hidden:
+                    tick._vertices.reset()
+                    if tick not in batch:
+                        tick._apply_vertices()
+                elif tick in batch:
+                    batch.collect(tick, self)
+                else:
+                    tick.display(self)
+                if profiler is not None:
+                    profiler.mark_tick(tick, i)
+        finally:
+            if skip_labels:
+                restore_register_run()
+                restore_register()
+        batch.apply()
+        if profiler is not None and batch.ticks:
+            profiler.mark('batch')
+        # update labels
+        labeller.make_labels()
+        if profiler is not None:
+            profiler.mark('make_labels')
+        if shared is not None:
+            shared.origin = (self.x, self.y)
+            shared.vertices = [tick._vertices.data[:tick._vertices.size]
+                               for tick in self.ticks]
+            shared.labels = labeller.drawn
+        self._record_pan_bounds()
+        
+    def _acquire_geometry(self, hidden, skip_labels):
+        '''the entry of :attr:`geometry_registry` for the coming redraw, or
+        None if its geometry can't be shared.'''
+        registry = self.geometry_registry
+        ticks = self.ticks
+        if registry is None or type(self.labeller) is not TickLabeller or \
+            self._batch.ticks or \
+            not all(tick._can_share_layout() and tick._can_share_labels() and
+                    not tick._keep_layout and tick._layout_source is None 
+                    for tick in ticks):
+            self._release_geometry()
+            return None
+        key = (tuple(tick._geometry_settings() for tick in ticks),
+               tuple(self.size), self.orientation, self.backward,
+               self.index_0, self.index_1, self.overscan, self.line_offset,
+               self.tick_label_padding, 
+               tuple(i for i, tick in enumerate(ticks) if tick in hidden),
+               skip_labels)
+        held = self._shared
+        if held is not None:
+            if held[0] is registry and held[1] == key:
+                return held[2]
+            self._release_geometry()
+        entry = registry.acquire(key, self)
+        self._shared = (registry, key, entry)
+        return entry
+    
+    def _release_geometry(self):
+        held = self._shared
+        if held is not None:
+            self._shared = None
+            held[0].release(held[1], self)
+            
+    def _apply_geometry(self, shared):
+        '''show the geometry computed by another tickline.'''
+        x, y = shared.origin
+        self._geometry_offset = (self.x - x, self.y - y)
+        self._reset_translation()
+        for tick, data in zip(self.ticks, shared.vertices):
+            vertices = tick._vertices
+            vertices.reset()
+            size = len(data)
+            vertices.reserve(size // 8)[:size] = data
+            vertices.size = size
+            tick._apply_vertices()
+        pool = self.labeller.pool
+        pool.attach(self.canvas)
+        pool.update(shared.labels)
+        
+    def _motion_hidden_ticks(self):
+        '''the ticks not to draw in the current redraw, as set by
+        :attr:`motion_hidden_levels` and :attr:`motion_max_ticks`.'''
+        hidden = set()
+        if not self.in_motion:
+            return hidden
+        n_levels = int(self.motion_hidden_levels)
+        if n_levels:
+            scale = self.scale
+            shown = [tick for tolerance, tick in self.scale_tolerances
+                     if tolerance <= scale]
+            hidden.update(shown[max(0, len(shown) - n_levels):])
+        max_ticks = self.motion_max_ticks
+        if max_ticks is not None:
+            hidden.update(tick for tick in self.ticks 
+                          if tick.count_ticks(self) > max_ticks)
+        return set(tick for tick in hidden 
+                   if _defining_class(tick, 'display') is Tick)
+    
+    def _on_in_motion(self, *args):
+        if not self.in_motion and self._degraded:
+            self.redraw()
+            
+    def _on_tick_data_changed(self, tick, index_lo, index_hi):
+        self.redraw_range(index_lo, index_hi)
+        
+    def _redraw_all(self, *args):
+        self._pan_bounds = None
+        self._trigger_update.cancel()
+        self.redraw_()
+        
+    def _update_graphics(self, *args):
+        if self.redraw.is_triggered:
+            # a full redraw is due this frame anyway
+            return
+        if self._pan_bounds is not None and self._can_translate():
+            self._translate_graphics()
+        else:
+            self.redraw_()
+            
+    def _extended_range(self):
+        '''the extended index range of the ticks, least index first and
+        without :attr:`overscan`.'''
+        d_tick = self.densest_tick
+        if d_tick is None:
+            return None
+        index_0 = d_tick.extended_index_0(self)
+        index_1 = d_tick.extended_index_1(self)
+        margin = self.overscan_margin()
+        return min(index_0, index_1) + margin, max(index_0, index_1) - margin
+    
+    def _record_pan_bounds(self):
+        self._pan_bounds = None
+        if not self.translate_on_pan:
+            return
+        lo, hi = -float('inf'), float('inf')
+        for tick in self.ticks:
+            tick_range = tick.pan_range(self)
+            if tick_range is None:
+                return
+            lo = max(lo, tick_range[0])
+            hi = min(hi, tick_range[1])
+        self._pan_bounds = lo, hi
+        self._pan_state = self.index_0, self.scale, self.densest_tick
+        
+    def _can_translate(self):
+        index_0, scale, densest_tick = self._pan_state
+        if densest_tick is not self.densest_tick or \
+            abs(self.scale - scale) > 1e-9 * abs(scale):
+            return False
+        extended = self._extended_range()
+        if extended is None:
+            return True
+        lo, hi = self._pan_bounds
+        return lo < extended[0] and extended[1] < hi
+    
+    def _translate_graphics(self):
+        index_0, scale, _ = self._pan_state
+        offset = (index_0 - self.index_0) * scale * self.dir
+        x, y = self._geometry_offset
+        if self.is_vertical():
+            self.translate_instr.xy = (x, y + offset)
+        else:
+            self.translate_instr.xy = (x + offset, y)
+            
+    def _reset_translation(self):
+        self.translate_instr.xy = self._geometry_offset
+        
     def _update_tolerances(self, *args):
         self.scale_tolerances = sorted(
                                [(tick.scale_factor * tick.min_space, tick) 
-                                for tick in self.ticks])
+                                for tick in self.ticks], 
+                               key=lambda pair: pair[0])
     
     def _update_effect_constants(self, *args):
         if not self.scroll_effect:
@@ -831,7 +2788,11 @@ class Tickline(StencilView):
             return False
         if super(Tickline, self).on_touch_down(touch):
             return True
+        self._take_touch(touch)
         
+    def _take_touch(self, touch):
+        '''pan and zoom with ``touch`` from now on.'''
+        x, y = touch.x, touch.y
         touch.grab(self)
         self._touches.append(touch)
         self._last_touch_pos[touch] = x, y
@@ -1004,6 +2965,36 @@ class Tick(Widget):
     
     :attr:`label_global` defaults to False.'''
     
+    vectorized = BooleanProperty(False)
+    '''if True and numpy is available, all the ticks of a redraw are computed
+    at once with numpy arrays instead of one by one, giving identical results.
+    This only applies when neither :meth:`tick_iter`, :meth:`draw` nor
+    :meth:`draw_tick` is overriden, and :meth:`tick_pos_index_iter` has a
+    vectorized counterpart, :meth:`tick_pos_index_arrays`. Otherwise, this
+    Tick silently falls back to drawing ticks one by one.
+    
+    .. versionadded:: 0.2.0
+    '''
+    
+    label_cache = ObjectProperty(label_texture_cache, allownone=True)
+    '''the :class:`LabelTextureCache` in which :meth:`get_label_texture` keeps
+    its textures. By default, all ticks share the module level 
+    ``label_texture_cache``. If None, every label is rasterized anew.
+    
+    Textures of this Tick are invalidated whenever :attr:`tick_size`,
+    :attr:`label_global` or :attr:`scale_factor` changes.
+    
+    .. versionadded:: 0.2.0
+    '''
+    
+    label_owner = ObjectProperty(None, allownone=True)
+    '''what the textures of this Tick are keyed under in :attr:`label_cache`,
+    by default its ``uid``. Ticks rendering their labels alike may share
+    textures by sharing an owner, as :class:`TicklineLink` does.
+    
+    .. versionadded:: 0.2.0
+    '''
+    
     #===========================================================================
     # private attributes
     #===========================================================================
@@ -1015,16 +3006,55 @@ class Tick(Widget):
     '''The instruction group used to draw ticks in addition to any other
     customizations.'''
     
+    batchable = BooleanProperty(True)
+    '''whether this Tick may be drawn together with the other ticks of a
+    :class:`Tickline` with :attr:`~Tickline.batch_ticks`. 
+    
+    .. versionadded:: 0.2.0
+    '''
+    
+    __events__ = ('on_data_changed',)
+    
     def __init__ (self, *args, **kw):
-        self._mesh = Mesh(mode='triangle_strip')
+        self._mesh = Mesh(fmt=QuadBuffer.fmt, mode='triangles')
+        self._meshes = [self._mesh]
+        self._vertices = QuadBuffer()
+        self._layout = None
+        self._layout_source = None
+        self._keep_layout = False
         self._color = Color(*self.tick_color)
         self.instr = instr = InstructionGroup()
         instr.add(self._color)
         instr.add(self._mesh)
         super(Tick, self).__init__(*args, **kw)
+        invalidate = self._invalidate_label_cache
+        self.bind(tick_size=invalidate,
+                  label_global=invalidate,
+                  scale_factor=invalidate)
 
     def on_tick_color(self, *args):
         self._color.rgba = self.tick_color
+        
+    def can_batch(self):
+        '''whether this Tick is drawn in the batch of a :class:`Tickline` 
+        with :attr:`~Tickline.batch_ticks`: if it's :attr:`batchable` and
+        draws through the default :meth:`display`, :meth:`draw` and 
+        :meth:`draw_tick`.
+        
+        .. versionadded:: 0.2.0
+        '''
+        return self.batchable and all(
+                    _defining_class(self, name) is Tick
+                    for name in ('display', 'draw', 'draw_tick'))
+        
+    def on_data_changed(self, index_lo, index_hi):
+        '''dispatched by ticks whose data changes outside of their own 
+        properties, with the global indices bounding the ticks that changed.
+        A :class:`Tickline` redraws in response only if they may be in view;
+        see :meth:`Tickline.redraw_range`.
+        
+        .. versionadded:: 0.2.0
+        '''
 
     def scale(self, sc):
         '''returns the spacing between ticks, given the global scale of 
@@ -1052,6 +3082,19 @@ class Tick(Widget):
         return index * self.scale_factor
     
     
+    def get_label_text(self, index):
+        '''
+        Return the label text for a tick given its ordinal position, or None
+        if there shouldn't be a label at ``index``.
+        
+        :param index: the ordinal number of a tick from the 0th tick, 
+            which is the tick that would have global index 0
+            if it were the first visible tick.
+            
+        .. versionadded:: 0.2.0
+        '''
+        return str(index / (self.label_global and self.scale_factor or 1))
+    
     def get_label_texture(self, index, **kw):
         '''
         Return a label *texture* for a tick given its ordinal position. 
@@ -1062,29 +3105,163 @@ class Tick(Widget):
             which is the tick that would have global index 0
             if it were the first visible tick.
         :param kw: keyword args passed to Label
+        
+        .. versionchanged:: 0.2.0
+            The text is given by :meth:`get_label_text`, and textures are
+            reused through :attr:`label_cache`.
         '''        
+        text = self.get_label_text(index)
+        if text is None:
+            return None
+        kw = self.label_options(**kw)
+        cache = self.label_cache
+        if cache is None:
+            return self.render_label(text, **kw)
+        key = self.label_cache_key(text, kw)
+        texture = cache.get(key)
+        if texture is None:
+            texture = self.render_label(text, **kw)
+            cache.put(key, texture)
+        return texture
+    
+    def measure_label(self, index, **kw):
+        '''return the ``(width, height)`` of the texture 
+        :meth:`get_label_texture` would return for ``index``, without 
+        rasterizing it, so that labellers may settle which labels to show 
+        before creating their textures.
+        
+        This is the size of the texture in :attr:`label_cache`, if any, and 
+        otherwise an estimate: the size of the first text of the same length
+        laid out with the same Label options, which is exact for numbers in
+        fonts with digits of equal width.
+        
+        Returns None if there's no label at ``index``, or if the size can't
+        be told without rendering, for example when 
+        :meth:`get_label_texture` or :meth:`render_label` is overriden 
+        without overriding this method.
+        
+        .. versionadded:: 0.2.0
+        '''
+        if _defining_class(self, 'get_label_texture') is not Tick or \
+            _defining_class(self, 'render_label') is not Tick:
+            return None
+        text = self.get_label_text(index)
+        if text is None:
+            return None
+        kw = self.label_options(**kw)
+        cache = self.label_cache
+        if cache is not None:
+            texture = cache.peek(self.label_cache_key(text, kw))
+            if texture is not None:
+                return texture.size
+        return _estimate_label_size(text, kw)
+    
+    def label_options(self, **kw):
+        '''return the Label keyword args the labels of this Tick are 
+        rendered with, given the keyword args ``kw`` passed to 
+        :meth:`get_label_texture`.
+        
+        .. versionadded:: 0.2.0
+        '''
         kw['font_size'] = self.tick_size[1] * 2
-        label = CoreLabel(
-            text=str(index / (self.label_global and self.scale_factor or 1)),
-            **kw)
+        return kw
+    
+    def render_label(self, text, **kw):
+        '''rasterize ``text`` and return its texture. 
+        
+        :param kw: keyword args passed to Label
+        
+        .. versionadded:: 0.2.0
+        '''
+        label = CoreLabel(text=text, **kw)
         label.refresh()
         return label.texture
     
+    def label_cache_key(self, text, kw):
+        '''return the key under which the texture of ``text``, rendered with 
+        Label keyword args ``kw``, is stored in :attr:`label_cache`.
+        
+        .. versionadded:: 0.2.0
+        '''
+        owner = self.label_owner
+        return (self.uid if owner is None else owner, text, _options_key(kw))
+    
     def extended_index_0(self, tickline):
         d_tick = tickline.densest_tick
         localize = d_tick.localize
         globalize = d_tick.globalize
+        index_0 = tickline.index_0 - tickline.dir * tickline.overscan_margin()
         
-        return globalize(localize(tickline.index_0) + tickline.backward)
+        return globalize(localize(index_0) + tickline.backward)
     
     def extended_index_1(self, tickline):
         d_tick = tickline.densest_tick
         localize = d_tick.localize
         globalize = d_tick.globalize
+        index_1 = tickline.index_1 + tickline.dir * tickline.overscan_margin()
+        
+        return globalize(localize(index_1) - tickline.backward)
+    
+        
+    def pan_range(self, tickline):
+        '''called at the end of each full redraw when 
+        :attr:`Tickline.translate_on_pan` is True. Returns an open interval
+        ``(lo, hi)`` of global indices: as long as the extended range of the
+        tickline (see :meth:`extended_index_0`) stays strictly within it,
+        every tick to be drawn has already been drawn by the last 
+        :meth:`display`, so that translating the graphics is enough.
+        
+        Returns None if this can't be determined, for example when 
+        :meth:`tick_iter` or :meth:`tick_pos_index_iter` is overriden
+        without overriding this method.
         
-        return globalize(localize(tickline.index_1) - tickline.backward)
+        .. versionadded:: 0.2.0
+        '''
+        if not self._uses_default_iter(Tick):
+            return None
+        inf = float('inf')
+        if self.scale(tickline.scale) < self.min_space:
+            return -inf, inf
+        lo, hi = self._local_extended_range(tickline)
+        # ticks lie at local indices congruent to dir * offset
+        offset = tickline.dir * self.offset
+        below = ceil(lo - offset) + offset - 1
+        above = floor(hi - offset) + offset + 1
+        return self.globalize(below), self.globalize(above)
+    
+    def count_ticks(self, tickline):
+        '''estimate, without drawing them, the number of ticks 
+        :meth:`display` would draw on ``tickline``. Used by 
+        :attr:`Tickline.motion_max_ticks`.
+        
+        .. versionadded:: 0.2.0
+        '''
+        if self.scale(tickline.scale) < self.min_space:
+            return 0
+        lo, hi = self._local_extended_range(tickline)
+        return int(hi - lo) + 1
     
+    def label_indices(self, tickline, lo, hi, reverse=False):
+        '''return an iterator of the indices, as passed to 
+        :meth:`get_label_texture`, of the ticks between the global indices
+        ``lo`` and ``hi``, in increasing order or, if ``reverse``, in 
+        decreasing order. Used by :class:`LabelPrefetcher` to label ticks
+        before they come into view.
+        
+        Returns None if this can't be determined, for example when 
+        :meth:`tick_iter` or :meth:`tick_pos_index_iter` is overriden 
+        without overriding this method.
         
+        .. versionadded:: 0.2.0
+        '''
+        if not self._uses_default_iter(Tick):
+            return None
+        offset = tickline.dir * self.offset
+        first = int(ceil(self.localize(lo) - offset))
+        last = int(floor(self.localize(hi) - offset))
+        ks = range(last, first - 1, -1) if reverse else range(first, last + 1)
+        return (k + offset for k in ks)
+    
     def tick_iter(self, tickline):
         '''generates tick information for graphing and labeling in an iterator.
         By default, calls :meth:`tick_pos_index_iter` to return a pair 
@@ -1109,26 +3286,86 @@ class Tick(Widget):
         tick_index, tick_pos, tick_sc = \
             self._get_index_n_pos_n_scale(tl, True)
         if tick_sc < self.min_space:
-            raise StopIteration
+            return
         condition = self._index_condition(tl, True)
         pos0 = tl.y if tl.is_vertical() else tl.x
         while condition(tick_index):
             yield tick_pos + pos0, tick_index
             tick_pos += tick_sc
             tick_index += tl.dir    
-        raise StopIteration
+    
+    def tick_pos_index_arrays(self, tl):
+        '''vectorized counterpart of :meth:`tick_pos_index_iter`: returns
+        a pair of numpy arrays holding respectively the positions and the 
+        (localized) indices of the ticks that should be drawn.
+        
+        :param tl: :class:`Tickline` that this Tick belongs to.
+        
+        .. versionadded:: 0.2.0
+        '''
+        tick_index, tick_pos, tick_sc = \
+            self._get_index_n_pos_n_scale(tl, True)
+        if tick_sc < self.min_space:
+            return np.empty(0), np.empty(0)
+        index_0 = self.localize(self.extended_index_0(tl))
+        index_1 = self.localize(self.extended_index_1(tl))
+        lo, hi = (index_1, index_0) if tl.backward else (index_0, index_1)
+        n = max(int(abs((index_1 - tick_index))) + 2, 1)
+        # accumulate like the scalar version does, to get the same floats
+        positions = np.empty(n)
+        positions[0] = tick_pos
+        positions[1:] = tick_sc
+        positions = np.cumsum(positions)
+        indices = np.empty(n)
+        indices[0] = tick_index
+        indices[1:] = tl.dir
+        indices = np.cumsum(indices)
+        inside = (lo <= indices) & (indices <= hi)
+        n = n if inside.all() else int(inside.argmin())
+        pos0 = tl.y if tl.is_vertical() else tl.x
+        return positions[:n] + pos0, indices[:n]
     
     def display(self, tickline):
         '''main method for displaying Ticks. This is called after every
-        scatter transform. Uses :attr:`draw` to handle actual drawing.
+        scatter transform. Uses :meth:`draw_ticks` to handle actual drawing.
+        
+        .. versionchanged:: 0.2.0
+            Vertices are accumulated in a :class:`QuadBuffer` reused between
+            redraws, and drawn in ``triangles`` mode with a position-only
+            vertex format.
+        '''
+        self._vertices.reset()
+        self.draw_ticks(tickline)
+        self._apply_vertices()
+        
+    def draw_ticks(self, tickline):
+        '''compute the graphics of all the ticks to be shown. By default, 
+        hands each item of :meth:`tick_iter` to :meth:`draw`, or, if
+        :attr:`vectorized`, computes all ticks at once. Unless :meth:`draw`
+        is overriden, the labels are registered all at once with 
+        :meth:`TickLabeller.register_run`.
+        
+        .. versionadded:: 0.2.0
         '''
-        mesh = self._mesh
-        self._vertices = []
-        for tick_info in self.tick_iter(tickline):
-            self.draw(tickline, tick_info)
-        indices = list(range(len(self._vertices) // 4))
-        mesh.vertices = self._vertices  
-        mesh.indices = indices
+        source = self._layout_source
+        if source is not None and source._lend_layout(self, tickline):
+            return
+        if self.vectorized and self._can_vectorize():
+            self._draw_ticks_vectorized(tickline)
+            return
+        if _defining_class(self, 'draw') is not Tick:
+            for tick_info in self.tick_iter(tickline):
+                self.draw(tickline, tick_info)
+            return
+        # as draw does, labelling all the ticks at once
+        draw_tick = self.draw_tick
+        indices = []
+        rects = []
+        for tick_pos, tick_index in self.tick_iter(tickline):
+            rects.append(draw_tick(tickline, tick_pos))
+            indices.append(tick_index)
+        self._keep(tickline, indices, rects)
+        _register_run(tickline.labeller, self, indices, rects)
         
     def draw(self, tickline, tick_info):
         '''Given information about a tick, present in on screen. May be 
@@ -1157,48 +3394,178 @@ class Tick(Widget):
     
     def draw_tick(self, tickline, tick_pos, return_only=False):
         tw, th = self.tick_size
+        if tickline.is_vertical():
+            x = self._tick_cross_pos(tickline)
+            y = tick_pos - tw / 2
+            height, width = tw, th
+        else:
+            y = self._tick_cross_pos(tickline)
+            x = tick_pos - tw / 2
+            width, height = tw, th
+        if not return_only:
+            self._vertices.add_quad(x, y, width, height)
+        return (x, y, width, height)
+    #===========================================================================
+    # private methods
+    #===========================================================================
+    def _invalidate_label_cache(self, *args):
+        cache = self.label_cache
+        if cache is not None:
+            owner = self.label_owner
+            cache.invalidate(self.uid if owner is None else owner)
+            
+    def _uses_default_iter(self, cls):
+        '''whether the ticks of this Tick are given by :meth:`tick_iter` of
+        :class:`Tick` and :meth:`tick_pos_index_iter` of ``cls``, so that the
+        methods of ``cls`` computing them otherwise apply.'''
+        return _defining_class(self, 'tick_iter') is Tick and \
+            _defining_class(self, 'tick_pos_index_iter') is cls
+    
+    def _local_extended_range(self, tickline):
+        '''the extended range of ``tickline`` in local indices, least
+        first.'''
+        index_0 = self.localize(self.extended_index_0(tickline))
+        index_1 = self.localize(self.extended_index_1(tickline))
+        return min(index_0, index_1), max(index_0, index_1)
+    
+    def _can_share_layout(self):
+        '''whether the ticks of this Tick only depend on the settings in
+        :meth:`_layout_key` and the view of the tickline.'''
+        cls = _defining_class
+        return all(cls(self, name) is Tick 
+                   for name in ('display', 'draw_ticks', 'draw', 'draw_tick',
+                                'tick_iter', 'tick_pos_index_iter', 
+                                'tick_pos_index_arrays'))
+    
+    def _can_share_labels(self):
+        '''whether the labels of this Tick only depend on its class and
+        :meth:`_geometry_settings`.'''
+        cls = _defining_class
+        return all(cls(self, name) in (Tick, LabellessTick)
+                   for name in ('get_label_text', 'get_label_texture', 
+                                'measure_label', 'label_options', 
+                                'render_label'))
+    
+    def _geometry_settings(self):
+        '''the settings the ticks and labels of this Tick depend on, if 
+        :meth:`_can_share_layout` and :meth:`_can_share_labels`.'''
+        return (type(self), self.scale_factor, self.offset, self.min_space,
+                self.min_label_space, tuple(self.tick_size), 
+                self.label_global, self.halign, self.valign)
+    
+    def _layout_key(self, tickline):
+        '''what the ticks drawn on ``tickline`` depend on, but for their
+        position across the line.'''
+        d_tick = tickline.densest_tick
+        return (type(self), self.scale_factor, self.offset, self.min_space,
+                tuple(self.tick_size), tickline.is_vertical(), 
+                tickline.backward, tickline.pos0, tickline.line_length,
+                tickline.index_0, tickline.index_1, tickline.overscan,
+                d_tick and d_tick.scale_factor)
+    
+    def _keep(self, tickline, indices, rects):
+        '''keep the ticks just drawn for :meth:`_lend_layout`.'''
+        if self._keep_layout:
+            self._layout = (self._layout_key(tickline), indices, rects,
+                            self._tick_cross_pos(tickline))
+            
+    def _lend_layout(self, tick, tickline):
+        '''draw ``tick`` on ``tickline`` by copying the ticks this Tick drew 
+        last, moved across the line, if they're the same. Returns whether it
+        did.'''
+        layout = self._layout
+        if layout is None or np is None or \
+            layout[0] != tick._layout_key(tickline):
+            return False
+        _, indices, rects, cross = layout
+        source = self._vertices
+        n_quads = len(rects)
+        if len(source) != n_quads:
+            # not drawn since
+            return False
+        shift = tick._tick_cross_pos(tickline) - cross
+        vertices = tick._vertices
+        size = 8 * n_quads
+        data = vertices.reserve(n_quads)
+        n = vertices.size
+        data[n:n + size] = source.data[:size]
+        vertices.size = n + size
+        if shift:
+            axis = 0 if tickline.is_vertical() else 1
+            np.frombuffer(data, dtype='f', count=n + size)[n + axis::2] += shift
+            if axis:
+                rects = [(x, y + shift, w, h) for x, y, w, h in rects]
+            else:
+                rects = [(x + shift, y, w, h) for x, y, w, h in rects]
+        _register_run(tickline.labeller, tick, indices, rects)
+        return True
+            
+    def _apply_vertices(self):
+        vertices = self._vertices
+        meshes = self._meshes
+        for _ in range(len(meshes), vertices.mesh_count()):
+            mesh = Mesh(fmt=QuadBuffer.fmt, mode='triangles')
+            meshes.append(mesh)
+            self.instr.add(mesh)
+        for chunk, mesh in enumerate(meshes):
+            vertices.apply(mesh, chunk)
+            
+    def _tick_cross_pos(self, tickline, length=None):
+        '''the coordinate, across the tickline, of the lower left corner of
+        the ticks, as determined by :attr:`halign` or :attr:`valign`, for
+        ticks ``length`` long (a number or an array), by default the length
+        in :attr:`tick_size`.'''
+        th = self.tick_size[1] if length is None else length
         if tickline.is_vertical():
             halign = self.halign
             if halign == 'left':
-                x = tickline.x
+                return tickline.x
             elif halign == 'line_left':
-                x = tickline.line_pos - th
+                return tickline.line_pos - th
             elif halign == 'line_right':
-                x = tickline.line_pos
+                return tickline.line_pos
             else:
-                x = tickline.right - th
-            y = tick_pos - tw / 2
-            height, width = tw, th
-            if not return_only:
-                self._vertices.extend([x, y, 0, 0,
-                                       x, y + height, 0, 0,
-                                       x + width, y + height, 0, 0,
-                                       x + width, y, 0, 0,
-                                       x, y, 0, 0,
-                                       x, y + height, 0, 0])
+                return tickline.right - th
         else:
             valign = self.valign
             if valign == 'top':
-                y = tickline.top - th
+                return tickline.top - th
             elif valign == 'line_top':
-                y = tickline.line_pos
+                return tickline.line_pos
             elif valign == 'line_bottom':
-                y = tickline.line_pos - th
+                return tickline.line_pos - th
             else:
-                y = tickline.y
-            x = tick_pos - tw / 2
-            width, height = tw, th
-            if not return_only:
-                self._vertices.extend([x, y, 0, 0,
-                                       x + width, y, 0, 0,
-                                       x + width, y + height, 0, 0,
-                                       x, y + height, 0, 0,
-                                       x, y, 0, 0,
-                                       x + width, y, 0, 0,])
-        return (x, y, width, height)
-    #===========================================================================
-    # private methods
-    #===========================================================================
+                return tickline.y
+            
+    def _can_vectorize(self):
+        if np is None:
+            return False
+        cls = _defining_class
+        return (cls(self, 'tick_pos_index_arrays') is 
+                cls(self, 'tick_pos_index_iter') and
+                cls(self, 'tick_iter') is Tick and
+                cls(self, 'draw') is Tick and
+                cls(self, 'draw_tick') is Tick)
+    
+    def _draw_ticks_vectorized(self, tickline):
+        positions, indices = self.tick_pos_index_arrays(tickline)
+        n = len(positions)
+        if not n:
+            return
+        tw, th = self.tick_size
+        cross = self._tick_cross_pos(tickline)
+        along = positions - tw / 2
+        if tickline.is_vertical():
+            x, y, width, height = cross, along, th, tw
+            rects = [(x, y_, width, height) for y_ in y.tolist()]
+        else:
+            x, y, width, height = along, cross, tw, th
+            rects = [(x_, y, width, height) for x_ in x.tolist()]
+        self._vertices.add_quads(x, y, width, height)
+        indices = indices.tolist()
+        self._keep(tickline, indices, rects)
+        _register_run(tickline.labeller, self, indices, rects)
+            
     def _get_index_n_pos_n_scale(self, tickline, extended=False):    
         ''' utility function for getting the first tick index and position
          at the bottom of the screen, along with the localized scale of the Tick.
@@ -1250,6 +3617,9 @@ class LabellessTick(Tick):
     '''same thing as :class:`Tick`, except no labels. Commonly used as
     the finest set of ticks.'''
 
+    def get_label_text(self, *args, **kw):
+        return None
+    
     def get_label_texture(self, *args, **kw):
         return None
     
@@ -1271,7 +3641,7 @@ class DataListTick(Tick):
         index_1 = self.localize(self.extended_index_1(tl))
         tick_sc = self.scale(tl.scale)
         if tick_sc < self.min_space:
-            raise StopIteration
+            return
             
         try:
             data_index = bisect_left(self.data, index_1 if tl.backward 
@@ -1284,8 +3654,872 @@ class DataListTick(Tick):
                 data_index += 1
                 tick_index = self.data[data_index]
         except IndexError:
-            raise StopIteration
+            return
+        
+    def pan_range(self, tickline):
+        if not self._uses_default_iter(DataListTick):
+            return None
+        inf = float('inf')
+        if self.scale(tickline.scale) < self.min_space:
+            return -inf, inf
+        lo, hi = self._local_extended_range(tickline)
+        data = self.data
+        # ticks drawn are data[i:j]
+        i = bisect_left(data, lo)
+        j = bisect(data, hi)
+        below = self.globalize(data[i - 1]) if i > 0 else -inf
+        above = self.globalize(data[j]) if j < len(data) else inf
+        return below, above
+    
+    def count_ticks(self, tickline):
+        if self.scale(tickline.scale) < self.min_space:
+            return 0
+        lo, hi = self._local_extended_range(tickline)
+        data = self.data
+        return bisect(data, hi) - bisect_left(data, lo)
+    
+    def label_indices(self, tickline, lo, hi, reverse=False):
+        if not self._uses_default_iter(DataListTick):
+            return None
+        data = self.data
+        i = bisect_left(data, self.localize(lo))
+        j = bisect(data, self.localize(hi))
+        return (data[k] for k in (range(j - 1, i - 1, -1) if reverse 
+                                  else range(i, j)))
+        
+    
+class SortedIndex(object):
+    '''a sorted collection of tick indices, with insertion and removal in
+    about logarithmic time, for use as :attr:`SortedDataListTick.data`.
+    
+    Values are kept in a list of sorted chunks of at most twice 
+    :attr:`load` values, along with the greatest value of each chunk. An
+    edit bisects the maxima, then the chunk, and only shifts the values of
+    that chunk.
+    
+    :param values: an iterable of initial values, in any order.
+    
+    .. versionadded:: 0.2.0
+    '''
+    
+    load = 1000
+    '''the size of the chunks values are split into initially.'''
+    
+    def __init__(self, values=()):
+        values = sorted(values)
+        load = self.load
+        self._chunks = [values[i:i + load] 
+                        for i in range(0, len(values), load)]
+        self._maxes = [chunk[-1] for chunk in self._chunks]
+        self._len = len(values)
+        
+    def __len__(self):
+        return self._len
+    
+    def __iter__(self):
+        for chunk in self._chunks:
+            for value in chunk:
+                yield value
+                
+    def __contains__(self, value):
+        i = bisect_left(self._maxes, value)
+        if i == len(self._maxes):
+            return False
+        chunk = self._chunks[i]
+        return chunk[bisect_left(chunk, value)] == value
+    
+    def add(self, value):
+        '''insert ``value``.'''
+        maxes = self._maxes
+        chunks = self._chunks
+        if not maxes:
+            chunks.append([value])
+            maxes.append(value)
+            self._len = 1
+            return
+        i = bisect_left(maxes, value)
+        if i == len(maxes):
+            i -= 1
+            chunks[i].append(value)
+            maxes[i] = value
+        else:
+            insort(chunks[i], value)
+        self._len += 1
+        chunk = chunks[i]
+        if len(chunk) > 2 * self.load:
+            half = len(chunk) // 2
+            chunks.insert(i + 1, chunk[half:])
+            del chunk[half:]
+            maxes.insert(i, chunk[-1])
+            
+    def remove(self, value):
+        '''remove one occurrence of ``value``; raises ValueError if there
+        is none.'''
+        maxes = self._maxes
+        i = bisect_left(maxes, value)
+        if i == len(maxes):
+            raise ValueError('%r not in SortedIndex' % (value,))
+        chunk = self._chunks[i]
+        j = bisect_left(chunk, value)
+        if chunk[j] != value:
+            raise ValueError('%r not in SortedIndex' % (value,))
+        del chunk[j]
+        self._len -= 1
+        if not chunk:
+            del self._chunks[i]
+            del maxes[i]
+        else:
+            maxes[i] = chunk[-1]
+            
+    def irange(self, lo, hi):
+        '''iterate over the values between ``lo`` and ``hi`` inclusive, 
+        least to greatest.'''
+        maxes = self._maxes
+        chunks = self._chunks
+        i = bisect_left(maxes, lo)
+        if i == len(maxes):
+            return
+        j = bisect_left(chunks[i], lo)
+        while i < len(chunks):
+            chunk = chunks[i]
+            for value in chunk[j:]:
+                if value > hi:
+                    return
+                yield value
+            i += 1
+            j = 0
+            
+    def lt(self, value):
+        '''return the greatest value less than ``value``, or None.'''
+        i = bisect_left(self._maxes, value)
+        if i < len(self._maxes):
+            chunk = self._chunks[i]
+            j = bisect_left(chunk, value)
+            if j:
+                return chunk[j - 1]
+        return self._maxes[i - 1] if i else None
+    
+    def gt(self, value):
+        '''return the least value greater than ``value``, or None.'''
+        i = bisect(self._maxes, value)
+        if i == len(self._maxes):
+            return None
+        chunk = self._chunks[i]
+        return chunk[bisect(chunk, value)]
+    
+class SortedDataListTick(DataListTick):
+    '''a :class:`DataListTick` whose ticks can be edited one at a time with
+    :meth:`add`, :meth:`remove` and :meth:`update`, without sorting or 
+    reassigning :attr:`data`.
+    
+    Each edit takes about logarithmic time, and dispatches 
+    :meth:`~Tick.on_data_changed` for the indices edited, so that the
+    :class:`Tickline` only redraws if they are in view.
+    
+    .. versionadded:: 0.2.0
+    '''
+    
+    data = ObjectProperty(None, allownone=True)
+    '''a :class:`SortedIndex` of local indices. Other iterables are
+    converted to one, in any order. Defaults to an empty one.'''
+    
+    def __init__(self, *args, **kw):
+        super(SortedDataListTick, self).__init__(*args, **kw)
+        if self.data is None:
+            self.data = SortedIndex()
+            
+    def on_data(self, *args):
+        data = self.data
+        if not isinstance(data, SortedIndex):
+            self.data = SortedIndex(() if data is None else data)
+            
+    def add(self, index):
+        '''add a tick at the local ``index``.'''
+        self.data.add(index)
+        index = self.globalize(index)
+        self.dispatch('on_data_changed', index, index)
+        
+    def remove(self, index):
+        '''remove a tick at the local ``index``; raises ValueError if there
+        is none.'''
+        self.data.remove(index)
+        index = self.globalize(index)
+        self.dispatch('on_data_changed', index, index)
+        
+    def update(self, old_index, new_index):
+        '''move a tick from the local ``old_index`` to ``new_index``.'''
+        data = self.data
+        data.remove(old_index)
+        data.add(new_index)
+        globalize = self.globalize
+        for index in (old_index, new_index):
+            index = globalize(index)
+            self.dispatch('on_data_changed', index, index)
+        
+    def tick_pos_index_iter(self, tl):
+        if self.scale(tl.scale) < self.min_space:
+            return
+        globalize = self.globalize
+        for index in self.data.irange(*self._local_extended_range(tl)):
+            yield tl.index2pos(globalize(index)), index
+            
+    def pan_range(self, tickline):
+        if not self._uses_default_iter(SortedDataListTick):
+            return None
+        inf = float('inf')
+        if self.scale(tickline.scale) < self.min_space:
+            return -inf, inf
+        lo, hi = self._local_extended_range(tickline)
+        below = self.data.lt(lo)
+        above = self.data.gt(hi)
+        return (-inf if below is None else self.globalize(below),
+                inf if above is None else self.globalize(above))
+    
+    def count_ticks(self, tickline):
+        if self.scale(tickline.scale) < self.min_space:
+            return 0
+        lo, hi = self._local_extended_range(tickline)
+        return sum(1 for _ in self.data.irange(lo, hi))
+    
+    def label_indices(self, tickline, lo, hi, reverse=False):
+        if not self._uses_default_iter(SortedDataListTick):
+            return None
+        indices = self.data.irange(self.localize(lo), self.localize(hi))
+        return reversed(list(indices)) if reverse else indices
+    
+class MappedData(object):
+    '''a read-only sorted sequence of tick indices memory-mapped from a 
+    binary file, for use as :attr:`ArrayDataListTick.data`.
+    
+    Opening the file is immediate whatever its size, and only the pages 
+    actually read are loaded: ``searchsorted`` touches a logarithmic number
+    of them, and a redraw the slice in view.
+    
+    The file is either a bare array of ``dtype`` values, or starts with
+    the header written by :meth:`write`, which records the dtype, the
+    scale and the number of values. Values are multiplied by :attr:`scale`
+    when read, which allows storing e.g. milliseconds as int64 for an index
+    in seconds.
+    
+    Requires numpy.
+    
+    :param path: the file to map.
+    :param dtype: the dtype of the values of a file without header.
+    :param scale: the scale of the values of a file without header.
+    :param offset: the number of bytes to skip at the start of a file
+        without header.
+    
+    .. versionadded:: 0.2.0
+    '''
+    
+    magic = b'TICKDATA'
+    header = Struct('<8s8sdQ')
+    '''magic, dtype string, scale and count, little endian.'''
+    
+    def __init__(self, path, dtype=float, scale=1, offset=0):
+        if np is None:
+            raise ImportError('MappedData requires numpy')
+        header = self.header
+        with open(path, 'rb') as f:
+            head = f.read(header.size)
+        count = None
+        if head[:len(self.magic)] == self.magic and \
+            len(head) == header.size:
+            _, dtype, scale, count = header.unpack(head)
+            dtype = dtype.rstrip(b'\0').decode('ascii')
+            offset = header.size
+        self.scale = scale
+        self.raw = np.memmap(path, dtype=np.dtype(dtype), mode='r', 
+                             offset=offset, shape=count)
+        
+    @classmethod
+    def write(cls, path, data, scale=1):
+        '''write the sorted array ``data`` to ``path`` with a header, in a
+        format :class:`MappedData` reads back.'''
+        data = np.asarray(data)
+        dtype = data.dtype.newbyteorder('<')
+        with open(path, 'wb') as f:
+            f.write(cls.header.pack(cls.magic, dtype.str.encode('ascii'), 
+                                    scale, len(data)))
+            f.write(data.astype(dtype, copy=False).tobytes())
+        
+    def __len__(self):
+        return len(self.raw)
+    
+    def __getitem__(self, key):
+        value = self.raw[key]
+        if self.scale == 1:
+            return value.astype(float) if isinstance(key, slice) \
+                    else float(value)
+        return value * float(self.scale)
+    
+    def __array__(self, dtype=None, copy=None):
+        return np.asarray(self[:], dtype=dtype)
+    
+    def searchsorted(self, value, side='left'):
+        '''as :meth:`numpy.ndarray.searchsorted`, for a scaled value.'''
+        if self.scale != 1:
+            value = value / float(self.scale)
+        return self.raw.searchsorted(value, side)
+    
+class ArrayDataListTick(DataListTick):
+    '''a :class:`DataListTick` whose :attr:`data` is a sorted numpy array,
+    meant for hundreds of thousands of ticks.
+    
+    The array is used as is, without being copied into a list. The ticks to
+    be drawn are found with ``searchsorted``, and their positions and 
+    vertices are computed all at once as in :attr:`Tick.vectorized`. Only
+    the visible slice of :attr:`data` is ever converted to floats, so any
+    numeric dtype works without a copy.
+    
+    Requires numpy.
+    
+    .. versionadded:: 0.2.0
+    '''
+    
+    data = ObjectProperty(None, allownone=True, force_dispatch=True)
+    '''a 1-dimensional numpy array or a :class:`MappedData` of local 
+    indices, sorted least to greatest. Other sequences are converted to a 
+    float64 array.'''
+    
+    vectorized = BooleanProperty(True)
+    
+    def __init__(self, *args, **kw):
+        if np is None:
+            raise ImportError('ArrayDataListTick requires numpy')
+        super(ArrayDataListTick, self).__init__(*args, **kw)
+        
+    def on_data(self, *args):
+        data = self.data
+        if data is not None and not isinstance(data, (np.ndarray, 
+                                                       MappedData)):
+            self.data = np.asarray(data, dtype=float)
+            
+    def index2pos(self, tickline, indices):
+        '''vectorized :meth:`Tickline.index2pos` of an array of local 
+        ``indices``.'''
+        # same operations as Tickline.index2pos, to get the same floats
+        index_0, index_1 = tickline.index_0, tickline.index_1
+        return (index_0 - indices / self.scale_factor) / \
+                (index_0 - index_1) * tickline.line_length + tickline.pos0
+            
+    def data_range(self, tickline):
+        '''return the slice ``(i, j)`` of :attr:`data` holding the ticks in
+        the extended range of ``tickline``.'''
+        data = self.data
+        if data is None:
+            return 0, 0
+        lo, hi = self._local_extended_range(tickline)
+        return (int(data.searchsorted(lo, 'left')),
+                int(data.searchsorted(hi, 'right')))
+    
+    def tick_pos_index_iter(self, tl):
+        positions, indices = self.tick_pos_index_arrays(tl)
+        return zip(positions.tolist(), indices.tolist())
+    
+    def tick_pos_index_arrays(self, tl):
+        if self.data is None or self.scale(tl.scale) < self.min_space:
+            return np.empty(0), np.empty(0)
+        i, j = self.data_range(tl)
+        indices = np.asarray(self.data[i:j], dtype=float)
+        return self.index2pos(tl, indices), indices
+    
+    def pan_range(self, tickline):
+        if not self._uses_default_iter(ArrayDataListTick):
+            return None
+        inf = float('inf')
+        data = self.data
+        if data is None or self.scale(tickline.scale) < self.min_space:
+            return -inf, inf
+        i, j = self.data_range(tickline)
+        below = self.globalize(data[i - 1]) if i > 0 else -inf
+        above = self.globalize(data[j]) if j < len(data) else inf
+        return below, above
+    
+    def count_ticks(self, tickline):
+        if self.scale(tickline.scale) < self.min_space:
+            return 0
+        i, j = self.data_range(tickline)
+        return j - i
+    
+    def label_indices(self, tickline, lo, hi, reverse=False):
+        if not self._uses_default_iter(ArrayDataListTick):
+            return None
+        data = self.data
+        if data is None:
+            return iter(())
+        i = int(data.searchsorted(self.localize(lo), 'left'))
+        j = int(data.searchsorted(self.localize(hi), 'right'))
+        return (float(data[k]) for k in (range(j - 1, i - 1, -1) if reverse
+                                         else range(i, j)))
+    
+class DataPyramid(object):
+    '''counts of sorted data per bucket, at power-of-two bucket widths.
+    
+    Level ``k`` divides the local indices into buckets 
+    ``[b * 2**k, (b + 1) * 2**k)`` for integers ``b``, and holds the sorted
+    numbers ``b`` of the nonempty buckets along with the number of data 
+    points in each, as a pair of arrays. Levels from about the average 
+    spacing of the data up to a single bucket are built upfront, each from
+    the one below. For n data points spanning ``s``, level 
+    :attr:`min_level` has buckets at least ``s / 2n`` wide, so the level 
+    ``j`` above it holds at most ``2n / 2**j + 1`` buckets, however the data 
+    is clustered: the levels take O(n) time and memory overall, beyond
+    the O(n) of bucketing the data once. Finer levels are left to 
+    :meth:`bucket`, on the slice of data of interest.
+    
+    For a :class:`MappedData`, the whole file is read once to build the
+    pyramid.
+    
+    .. versionadded:: 0.2.0
+    '''
+    
+    def __init__(self, data):
+        data = np.asarray(data)
+        self.levels = {}
+        n = len(data)
+        span = float(data[-1] - data[0]) if n else 0
+        self.min_level = k = int(floor(log(span / n, 2))) if span > 0 else 0
+        buckets, counts = self.bucket(data, k)
+        self.levels[k] = buckets, counts
+        while len(buckets) > 1:
+            k += 1
+            # floor division by 2, also for negative buckets
+            buckets, counts = self._merge(buckets >> 1, counts)
+            self.levels[k] = buckets, counts
+        self.max_level = k
+        
+    def level(self, k):
+        '''return the ``(buckets, counts)`` arrays of level ``k``, which must
+        be at least :attr:`min_level`.'''
+        return self.levels[min(k, self.max_level)]
+    
+    @classmethod
+    def bucket(cls, data, k):
+        '''return the ``(buckets, counts)`` arrays of the sorted ``data`` at
+        level ``k``.'''
+        buckets = np.floor(data / 2. ** k).astype(np.int64)
+        return cls._merge(buckets, np.ones(len(buckets), dtype=np.int64))
+    
+    @staticmethod
+    def _merge(buckets, counts):
+        if not len(buckets):
+            return buckets, counts
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        return buckets[starts], np.add.reduceat(counts, starts)
+    
+class AggregatedDataListTick(ArrayDataListTick):
+    '''an :class:`ArrayDataListTick` that draws at most one mark per
+    :attr:`resolution` pixels when too many data points are in view.
+    
+    When the visible points outnumber the available pixel columns, the
+    points are grouped into the buckets of a level of :attr:`pyramid`, chosen
+    from :attr:`Tickline.scale` so that buckets are at least
+    :attr:`resolution` pixels wide, and each nonempty bucket is drawn as a 
+    single unlabelled mark at its center. The cost of a redraw then depends
+    on the size of the widget rather than the size of the data. Otherwise, 
+    the points are drawn and labelled individually as by 
+    :class:`ArrayDataListTick`.
+    
+    Which way the ticks are drawn is decided at each full redraw.
+    
+    .. versionadded:: 0.2.0
+    '''
+    
+    resolution = NumericProperty(1)
+    '''the minimal spacing in pixels between aggregated marks.'''
+    
+    count_intensity = BooleanProperty(False)
+    '''if True, the length of aggregated marks grows with the logarithm
+    of the number of points they represent, from a quarter of 
+    ``tick_size[1]`` for a single point, to the full length for the largest
+    count in view.'''
+    
+    pyramid = ObjectProperty(None, allownone=True)
+    '''the :class:`DataPyramid` of :attr:`data`, rebuilt whenever 
+    :attr:`data` changes.'''
+    
+    def __init__(self, *args, **kw):
+        self._lod_level = None
+        super(AggregatedDataListTick, self).__init__(*args, **kw)
+        
+    def on_data(self, *args):
+        data = self.data
+        if data is not None and not isinstance(data, (np.ndarray, 
+                                                       MappedData)):
+            # converting dispatches on_data again
+            super(AggregatedDataListTick, self).on_data(*args)
+            return
+        self.pyramid = DataPyramid(data) if data is not None and len(data) \
+                        else None
+        
+    def lod_level(self, tickline):
+        '''return the level of :attr:`pyramid` the ticks should be drawn at,
+        or None if they should be drawn individually.'''
+        tick_sc = self.scale(tickline.scale)
+        if self.pyramid is None or tick_sc < self.min_space:
+            return None
+        i, j = self.data_range(tickline)
+        resolution = self.resolution
+        if j - i <= tickline.line_length / resolution:
+            return None
+        return int(ceil(log(resolution / tick_sc, 2)))
+    
+    def count_ticks(self, tickline):
+        if self.lod_level(tickline) is None:
+            return super(AggregatedDataListTick, self).count_ticks(tickline)
+        # at most one mark per bucket, and one bucket per resolution pixels
+        return int(tickline.line_length / self.resolution) + 1
+    
+    def label_indices(self, tickline, lo, hi, reverse=False):
+        if self.lod_level(tickline) is not None:
+            # aggregated marks aren't labelled
+            return iter(())
+        return super(AggregatedDataListTick, self).label_indices(
+                                                tickline, lo, hi, reverse)
+    
+    def draw_ticks(self, tickline):
+        self._lod_level = k = self.lod_level(tickline)
+        if k is None:
+            super(AggregatedDataListTick, self).draw_ticks(tickline)
+            return
+        width = 2. ** k
+        buckets, counts, _, _ = self._bucket_slice(tickline, k)
+        if not len(buckets):
+            return
+        positions = self.index2pos(tickline, (buckets + .5) * width)
+        tw, th = self.tick_size
+        if self.count_intensity:
+            weights = np.log1p(counts)
+            lengths = th * (.25 + .75 * weights / weights.max())
+        else:
+            lengths = th
+        cross = self._tick_cross_pos(tickline, lengths)
+        along = positions - tw / 2
+        if tickline.is_vertical():
+            self._vertices.add_quads(cross, along, lengths, tw)
+        else:
+            self._vertices.add_quads(along, cross, tw, lengths)
+            
+    def pan_range(self, tickline):
+        k = self._lod_level
+        if k is None:
+            return super(AggregatedDataListTick, self).pan_range(tickline)
+        if not self._uses_default_iter(ArrayDataListTick):
+            return None
+        width = 2. ** k
+        _, _, below, above = self._bucket_slice(tickline, k)
+        # the buckets just out of the ones drawn must stay out of the view
+        return (-float('inf') if below is None else
+                    self.globalize((below + 1) * width),
+                float('inf') if above is None else
+                    self.globalize(above * width))
+    
+    def _bucket_slice(self, tickline, k):
+        '''return the buckets and counts of level ``k`` in the extended range
+        of ``tickline``, and the numbers of the nonempty buckets just below
+        and above them, or None.'''
+        width = 2. ** k
+        lo, hi = self._local_extended_range(tickline)
+        lo = floor(lo / width)
+        hi = floor(hi / width)
+        pyramid = self.pyramid
+        if k >= pyramid.min_level:
+            buckets, counts = pyramid.level(k)
+            i = int(buckets.searchsorted(lo, 'left'))
+            j = int(buckets.searchsorted(hi, 'right'))
+            return (buckets[i:j], counts[i:j],
+                    int(buckets[i - 1]) if i > 0 else None,
+                    int(buckets[j]) if j < len(buckets) else None)
+        # only bucket the points in view; dividing by a power of two is 
+        # exact, so the slice holds exactly the buckets lo to hi
+        data = self.data
+        i = int(data.searchsorted(lo * width, 'left'))
+        j = int(data.searchsorted((hi + 1) * width, 'left'))
+        buckets, counts = pyramid.bucket(data[i:j], k)
+        return (buckets, counts,
+                int(floor(data[i - 1] / width)) if i > 0 else None,
+                int(floor(data[j] / width)) if j < len(data) else None)
+    
+class StreamingDataListTick(ArrayDataListTick):
+    '''an :class:`ArrayDataListTick` for live data, holding the latest
+    :attr:`capacity` indices in a ring buffer.
+    
+    New indices are given with :meth:`append` or :meth:`extend_batch`, and
+    all those given in a frame are added at once on the next frame, the 
+    oldest ones being dropped once :attr:`capacity` is reached. The tick
+    then dispatches :meth:`~Tick.on_data_changed` for the indices added and
+    dropped, so that its :class:`Tickline` redraws only if they are in view.
+    
+    Every value is stored twice, a capacity apart, so that :attr:`data` is
+    always a contiguous view of the buffer, whatever its start.
+    
+    .. versionadded:: 0.2.0
+    '''
+    
+    capacity = NumericProperty(100000)
+    '''the maximal number of indices held. Changing it keeps the latest
+    ones.'''
+    
+    def __init__(self, *args, **kw):
+        data = kw.pop('data', None)
+        self._ring = None
+        self._start = self._count = 0
+        self._pending = []
+        self._batches = []
+        self._last = None
+        super(StreamingDataListTick, self).__init__(*args, **kw)
+        self._trigger_flush = Clock.create_trigger(self.flush, -1)
+        self.on_capacity()
+        if data is not None:
+            self.data = data
+        
+    def append(self, index):
+        '''add a local ``index``, no less than those given before.'''
+        last = self._last
+        if last is not None and index < last:
+            raise ValueError('%r is less than the last index %r' % 
+                             (index, last))
+        self._pending.append(index)
+        self._last = index
+        self._trigger_flush()
+        
+    def extend_batch(self, indices):
+        '''add a sorted sequence of local ``indices``, no less than those
+        given before.'''
+        indices = np.asarray(indices, dtype=float).ravel()
+        if not len(indices):
+            return
+        last = self._last
+        if last is not None and indices[0] < last or \
+            (np.diff(indices) < 0).any():
+            raise ValueError('indices are not sorted after the last index '
+                             '%r' % last)
+        if self._pending:
+            self._batches.append(np.asarray(self._pending, dtype=float))
+            self._pending = []
+        self._batches.append(indices)
+        self._last = indices[-1]
+        self._trigger_flush()
+        
+    def flush(self, *args):
+        '''add the indices given since the last frame right away.'''
+        batches = self._batches
+        if self._pending:
+            batches.append(np.asarray(self._pending, dtype=float))
+            self._pending = []
+        if not batches:
+            return
+        values = np.concatenate(batches)
+        self._batches = []
+        first = self.data[0] if self._count else None
+        evicted = self._write(values)
+        self.data = self._view()
+        if evicted and first is not None:
+            self.dispatch('on_data_changed', self.globalize(first), 
+                          self.globalize(self.data[0]))
+        self.dispatch('on_data_changed', self.globalize(values[0]), 
+                      self.globalize(values[-1]))
+        
+    def on_capacity(self, *args):
+        capacity = int(self.capacity)
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1')
+        kept = self._view() if self._ring is not None else np.empty(0)
+        self._ring = np.empty(2 * capacity)
+        self._start = self._count = 0
+        self._write(kept[-capacity:])
+        self.data = self._view()
+        
+    def on_data(self, *args):
+        data = self.data
+        if self._ring is None or isinstance(data, np.ndarray) and \
+            data.base is self._ring:
+            return
+        # data set from outside: replace the content of the buffer
+        self._start = self._count = 0
+        self._pending = []
+        self._batches = []
+        data = np.empty(0) if data is None else \
+                np.asarray(data, dtype=float).ravel()
+        self._last = data[-1] if len(data) else None
+        self._write(data[-int(self.capacity):])
+        self.data = self._view()
+        
+    def _view(self):
+        start = self._start
+        return self._ring[start:start + self._count]
+        
+    def _write(self, values):
+        '''write sorted ``values`` after the current ones, and return the
+        number of values dropped.'''
+        capacity = len(self._ring) // 2
+        n = len(values)
+        count = self._count
+        if n > capacity:
+            values = values[-capacity:]
+        positions = (self._start + count + 
+                     np.arange(len(values))) % capacity
+        ring = self._ring
+        ring[positions] = values
+        ring[positions + capacity] = values
+        evicted = max(0, count + n - capacity)
+        self._start = (self._start + min(evicted, count)) % capacity
+        if n > capacity:
+            self._start = int(positions[0])
+        self._count = min(count + n, capacity)
+        return evicted
+    
+class StyledDataListTick(ArrayDataListTick):
+    '''an :class:`ArrayDataListTick` whose items each have their own color,
+    length and label, given as arrays parallel to :attr:`data`.
+    
+    All the items are drawn by one Mesh, whatever their colors: the 
+    distinct colors are gathered in a palette texture, which every vertex
+    points into, as in :class:`TickBatch`. The visible slice of all the 
+    arrays is found with a single search of :attr:`data`. One such Tick 
+    thus replaces one :class:`DataListTick` per category of items.
+    
+    Since it draws with its own palette, it is not :attr:`~Tick.batchable`.
+    
+    Requires numpy.
+    
+    .. versionadded:: 0.2.0
+    '''
+    
+    colors = ObjectProperty(None, allownone=True, force_dispatch=True)
+    '''an array of shape ``(len(data), 4)`` or ``(len(data), 3)`` of the
+    rgba or rgb colors of the items, which are multiplied by 
+    :attr:`~Tick.tick_color`. If None, all items are drawn in 
+    :attr:`~Tick.tick_color`.'''
+    
+    lengths = ObjectProperty(None, allownone=True, force_dispatch=True)
+    '''an array of the lengths of the items, across the tickline. If None,
+    all items are ``tick_size[1]`` long.'''
+    
+    labels = ObjectProperty(None, allownone=True, force_dispatch=True)
+    '''a sequence of the label texts of the items, None for no label. If
+    None, the items are labelled with their index as by :class:`Tick`.'''
+    
+    batchable = BooleanProperty(False)
+    
+    def __init__(self, *args, **kw):
+        self._palette = None
+        self._color_ids = None
+        self._uv = None
+        self._styled = None
+        self._label_texts = {}
+        super(StyledDataListTick, self).__init__(*args, **kw)
+        # draw with texture coordinates into the palette
+        instr = self.instr
+        for mesh in self._meshes:
+            instr.remove(mesh)
+        self._mesh = Mesh(fmt=TickBatch.fmt, mode='triangles')
+        self._meshes = [self._mesh]
+        instr.add(self._mesh)
+        self.on_colors()
+        
+    def on_colors(self, *args):
+        colors = self.colors
+        if colors is None:
+            palette = np.full((1, 4), 255, dtype=np.uint8)
+            self._color_ids = None
+        else:
+            colors = np.asarray(colors, dtype=float)
+            if colors.shape[1] == 3:
+                colors = np.hstack([colors, np.ones((len(colors), 1))])
+            colors = np.round(np.clip(colors, 0, 1) * 255).astype(np.uint8)
+            palette, ids = np.unique(colors, axis=0, return_inverse=True)
+            self._color_ids = ids.ravel()
+        # lay the palette out in rows of at most 1024 texels
+        n = len(palette)
+        width = 1
+        while width < min(n, 1024):
+            width *= 2
+        height = 1
+        while height * width < n:
+            height *= 2
+        texels = np.zeros((height * width, 4), dtype=np.uint8)
+        texels[:n] = palette
+        texture = self._palette
+        if texture is None or texture.size != (width, height):
+            self._palette = texture = Texture.create(size=(width, height),
+                                                     colorfmt='rgba')
+            texture.min_filter = texture.mag_filter = 'nearest'
+        for mesh in self._meshes:
+            mesh.texture = texture
+        texture.blit_buffer(texels.tobytes(), colorfmt='rgba', 
+                            bufferfmt='ubyte')
+        k = np.arange(n)
+        self._uv = np.column_stack([(k % width + .5) / width, 
+                                    (k // width + .5) / height]).astype('f')
+        
+    def get_label_text(self, index):
+        labels = self._label_texts
+        if index in labels:
+            return labels[index]
+        return super(StyledDataListTick, self).get_label_text(index)
+    
+    def label_indices(self, tickline, lo, hi, reverse=False):
+        # the texts of the labels are only known for the ticks drawn
+        return None
         
+    def draw_ticks(self, tickline):
+        self._styled = None
+        if self.scale(tickline.scale) < self.min_space:
+            return
+        i, j = self.data_range(tickline)
+        if i == j:
+            return
+        indices = np.asarray(self.data[i:j], dtype=float)
+        positions = self.index2pos(tickline, indices)
+        tw, th = self.tick_size
+        lengths = th if self.lengths is None else \
+                    np.asarray(self.lengths[i:j], dtype=float)
+        cross = self._tick_cross_pos(tickline, lengths)
+        along = positions - tw / 2
+        if tickline.is_vertical():
+            x, y, width, height = cross, along, lengths, tw
+        else:
+            x, y, width, height = along, cross, tw, lengths
+        x, y, width, height = np.broadcast_arrays(x, y, width, height)
+        self._vertices.add_quads(x, y, width, height)
+        ids = self._color_ids
+        self._styled = self._uv[0:1] if ids is None else self._uv[ids[i:j]]
+        indices = indices.tolist()
+        labels = self.labels
+        self._label_texts = {} if labels is None else \
+                            dict(zip(indices, labels[i:j]))
+        _register_run(tickline.labeller, self, indices, 
+                      list(zip(x.tolist(), y.tolist(), width.tolist(), 
+                               height.tolist())))
+            
+    def _apply_vertices(self):
+        vertices = self._vertices
+        n_quads = len(vertices)
+        styled = np.empty((n_quads, 4, 4), dtype='f')
+        if n_quads:
+            styled[:, :, :2] = np.frombuffer(vertices.data, dtype='f', 
+                count=vertices.size).reshape(n_quads, 4, 2)
+            styled[:, :, 2:] = self._styled[:, None, :]
+        styled = styled.ravel()
+        max_quads = QuadBuffer.max_quads
+        meshes = self._meshes
+        for _ in range(len(meshes), vertices.mesh_count()):
+            mesh = Mesh(fmt=TickBatch.fmt, mode='triangles', 
+                        texture=self._palette)
+            meshes.append(mesh)
+            self.instr.add(mesh)
+        for chunk, mesh in enumerate(meshes):
+            start = chunk * max_quads
+            stop = min(n_quads, start + max_quads)
+            if stop <= start:
+                # kivy can't take empty buffers
+                mesh.vertices = []
+                mesh.indices = []
+                continue
+            mesh.vertices = memoryview(styled[16 * start:16 * stop])
+            mesh.indices = _quad_indices(stop - start)
     
 if __name__ == '__main__':
     from kivy.base import runTouchApp
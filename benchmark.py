@@ -0,0 +1,404 @@
+'''
+Benchmarks
+==========
+
+Headless benchmarks of the redraw pipeline of :class:`Tickline`:
+:meth:`Tickline.redraw_`, :meth:`Tick.display`,
+:meth:`DataListTick.tick_pos_index_iter`, :meth:`TickLabeller.register` and
+:meth:`TickLabeller.make_labels`, over tick density, number of ticks,
+orientation and direction, :class:`DataListTick` size, and labelled versus
+labelless setups.
+
+Run it from anywhere, without a display::
+
+    python benchmark.py                       # all cases, as a table
+    python benchmark.py -k datalist -r 50     # cases matching 'datalist'
+    python benchmark.py --json new.json       # machine readable results
+    python benchmark.py --compare old.json    # exit 1 on regressions
+
+No window or OpenGL context is created: Kivy runs with its ``mock`` GL
+backend, and the vertex instructions and textures used by the package are
+replaced by stand-ins that keep the CPU work of the real ones, such as
+copying vertices and rasterizing label text, but upload nothing. Times are
+thus comparable between runs and releases, not with those of a real
+window. Set ``KIVY_GL_BACKEND`` to run against real graphics instead.
+
+For each case and operation, the median, minimum and mean time per call
+are reported, along with the memory allocated by one call, as traced by
+:mod:`tracemalloc` in a separate pass.
+'''
+
+import os
+import sys
+import json
+import platform
+from timeit import default_timer
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+HEADLESS = 'KIVY_GL_BACKEND' not in os.environ
+
+
+def load_package(headless=HEADLESS):
+    '''set up Kivy, to run without a display if ``headless``, then import the
+    package this file belongs to as ``tickline``.'''
+    if headless:
+        os.environ['KIVY_GL_BACKEND'] = 'mock'
+        os.environ.setdefault('KIVY_WINDOW', '')
+        # metrics would otherwise ask the window for its dpi
+        os.environ.setdefault('KIVY_DPI', '96')
+        os.environ.setdefault('KIVY_METRICS_DENSITY', '1')
+        os.environ.setdefault('KIVY_METRICS_FONTSCALE', '1')
+    os.environ.setdefault('KIVY_NO_ARGS', '1')
+    # leave logging, and stderr, to python: only warnings are shown
+    os.environ.setdefault('KIVY_LOG_MODE', 'PYTHON')
+    if __package__:
+        package = sys.modules[__package__]
+    else:
+        import importlib.util
+        here = os.path.dirname(os.path.abspath(__file__))
+        spec = importlib.util.spec_from_file_location(
+                    'tickline', os.path.join(here, '__init__.py'),
+                    submodule_search_locations=[here])
+        package = importlib.util.module_from_spec(spec)
+        sys.modules['tickline'] = package
+        spec.loader.exec_module(package)
+    if headless:
+        stub_graphics(package)
+    return package
+
+#===============================================================================
+# graphics stand-ins
+#===============================================================================
+
+class FakeTexture(object):
+    '''stands for a :class:`~kivy.graphics.texture.Texture`. Content is
+    produced as usual, e.g. text is rasterized, but never uploaded. As with
+    kivy, a texture given a callback is filled when an instruction first
+    uses it.'''
+
+    def __init__(self, size, tex_coords=None):
+        self.size = self.width, self.height = size
+        self.tex_coords = tex_coords or (0., 0., 1., 0., 1., 1., 0., 1.)
+        self.min_filter = self.mag_filter = 'linear'
+        self._callback = None
+
+    @classmethod
+    def create(cls, size=(128, 128), callback=None, **kw):
+        texture = cls(tuple(size))
+        texture._callback = callback
+        return texture
+
+    def ask_update(self, callback):
+        self._callback = callback
+
+    def fill(self):
+        callback = self._callback
+        if callback is not None:
+            self._callback = None
+            callback(self)
+
+    def blit_buffer(self, *args, **kw):
+        pass
+
+    def blit_data(self, *args, **kw):
+        pass
+
+    def flip_vertical(self):
+        pass
+
+    def add_reload_observer(self, callback):
+        pass
+
+    def get_region(self, x, y, width, height):
+        w, h = float(self.width), float(self.height)
+        u0, v0, u1, v1 = x / w, y / h, (x + width) / w, (y + height) / h
+        return FakeTexture((width, height),
+                           (u0, v0, u1, v0, u1, v1, u0, v1))
+
+def fake_instruction(name, copied=()):
+    '''make a stand-in for the vertex instruction ``name``, which copies the
+    buffers given as the properties ``copied`` as the real one would.'''
+    from kivy.graphics import InstructionGroup
+
+    def __init__(self, **kw):
+        InstructionGroup.__init__(self)
+        for key, value in kw.items():
+            setattr(self, key, value)
+
+    def __setattr__(self, key, value):
+        if key in copied and not isinstance(value, (list, tuple)):
+            value = bytes(memoryview(value).cast('B'))
+        elif key == 'texture' and isinstance(value, FakeTexture):
+            value.fill()
+        object.__setattr__(self, key, value)
+
+    attributes = dict(__init__=__init__, __setattr__=__setattr__,
+                      texture=None, pos=(0, 0), size=(0, 0), points=(),
+                      vertices=(), indices=())
+    return type(name, (InstructionGroup,), attributes)
+
+class HeadlessWindow(object):
+    '''stands for the window widgets expect to exist when created.'''
+
+def stub_graphics(package):
+    '''replace the vertex instructions and textures used by ``package``, and
+    the window.'''
+    from kivy.base import EventLoop
+    if not EventLoop.window:
+        EventLoop.window = HeadlessWindow()
+    import kivy.core.text
+    from kivy.factory import Factory
+    kivy.core.text.Texture = FakeTexture
+    package.Texture = FakeTexture
+    for name, copied in (('Mesh', ('vertices', 'indices')), ('Rectangle', ()),
+                         ('Line', ()), ('BorderImage', ())):
+        cls = fake_instruction(name, copied)
+        setattr(package, name, cls)
+        # also for kv rules, such as those of StencilView
+        Factory.unregister(name)
+        Factory.register(name, cls=cls)
+
+#===============================================================================
+# cases
+#===============================================================================
+
+def make_cases(T):
+    '''return a list of ``(name, params, factory)``, where ``factory()``
+    returns a ready :class:`Tickline`.'''
+    cases = []
+
+    def add(name, params, **kw):
+        def factory():
+            kw_ = dict(size=(800, 200), orientation='horizontal')
+            kw_.update(kw)
+            ticks = kw_.pop('ticks')()
+            tickline = T.Tickline(ticks=ticks, **kw_)
+            tickline.redraw_()
+            return tickline
+        cases.append((name, params, factory))
+
+    # tick density: the number of ticks in view
+    for span in (4, 40, 400):
+        add('density-%d' % span, dict(span=span),
+            index_0=0, index_1=span,
+            ticks=lambda: [T.Tick(min_space=0),
+                           T.LabellessTick(scale_factor=10., min_space=0)])
+    # number of tick levels
+    for n in (1, 3, 6):
+        add('levels-%d' % n, dict(levels=n), index_0=0, index_1=10,
+            ticks=lambda n=n: [T.Tick(scale_factor=2. ** k,
+                                      label_global=True)
+                               for k in range(n)])
+    # orientation and direction
+    for orientation in ('horizontal', 'vertical'):
+        for backward in (False, True):
+            add('%s%s' % (orientation, '-backward' if backward else ''),
+                dict(orientation=orientation, backward=backward),
+                orientation=orientation, backward=backward,
+                size=(800, 200) if orientation == 'horizontal'
+                                else (200, 800),
+                index_0=10 if backward else 0,
+                index_1=0 if backward else 10,
+                ticks=lambda: [T.Tick(), T.Tick(scale_factor=5.,
+                                                label_global=True)])
+    # size of DataListTick data, with the same number of ticks in view
+    for size in (10 ** 3, 10 ** 5):
+        data = [i * 1000. / size for i in range(size)]
+        add('datalist-%d' % size, dict(data_size=size),
+            index_0=500, index_1=500 + 40000. / size,
+            ticks=lambda data=data: [T.DataListTick(data=data, min_space=0)])
+    # labelled versus labelless ticks
+    for labelled in (True, False):
+        add('labels-%s' % ('on' if labelled else 'off'),
+            dict(labelled=labelled), index_0=0, index_1=20,
+            ticks=lambda labelled=labelled:
+                [(T.Tick if labelled else T.LabellessTick)(
+                    scale_factor=float(sf), min_space=0,
+                    min_label_space=0) for sf in (1, 5, 10)])
+    return cases
+
+#===============================================================================
+# operations
+#===============================================================================
+
+def operations(T, tickline):
+    '''return a list of ``(op, callable)`` timing each stage of a redraw of
+    ``tickline``.'''
+    ticks = tickline.ticks
+    labeller = tickline.labeller
+    shift = [1e-3 * (tickline.index_1 - tickline.index_0)]
+
+    def redraw():
+        # pan back and forth, so labels are mostly cache hits as in a pan
+        shift[0] = -shift[0]
+        tickline.index_0 += shift[0]
+        tickline.index_1 += shift[0]
+        tickline.redraw_()
+    ops = [('redraw', redraw)]
+
+    # the registrations of a redraw, to be replayed on their own; ticks
+    # register runs of labels, and single ones only if they must
+    calls = []
+
+    def recorder(name):
+        return lambda *args: calls.append((name, args))
+    methods = [name for name in ('register', 'register_run')
+               if hasattr(labeller, name)]
+    for name in methods:
+        setattr(labeller, name, recorder(name))
+    try:
+        labeller.re_init()
+        for tick in ticks:
+            tick.display(tickline)
+    finally:
+        for name in methods:
+            delattr(labeller, name)
+
+    def display():
+        labeller.re_init()
+        for tick in ticks:
+            tick.display(tickline)
+    ops.append(('display', display))
+
+    data_ticks = [tick for tick in ticks if isinstance(tick, T.DataListTick)]
+    if data_ticks:
+        def tick_pos_index_iter():
+            for tick in data_ticks:
+                for _ in tick.tick_pos_index_iter(tickline):
+                    pass
+        ops.append(('tick_pos_index_iter', tick_pos_index_iter))
+
+    registrations = [(getattr(labeller, name), args) for name, args in calls]
+
+    def register_all():
+        labeller.re_init()
+        for register, args in registrations:
+            register(*args)
+    ops.append(('register', register_all))
+
+    def make_labels():
+        labeller.make_labels()
+    ops.append(('make_labels', make_labels))
+    return ops
+
+#===============================================================================
+# measuring
+#===============================================================================
+
+def measure(func, repeat, number):
+    '''return the times per call of ``repeat`` rounds of ``number`` calls
+    of ``func``, and the bytes and blocks allocated by one call.'''
+    func()
+    times = []
+    for _ in range(repeat):
+        start = default_timer()
+        for _ in range(number):
+            func()
+        times.append((default_timer() - start) / number)
+    alloc_bytes = alloc_blocks = None
+    if tracemalloc is not None:
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        func()
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        stats = after.compare_to(before, 'filename')
+        alloc_bytes = sum(stat.size_diff for stat in stats
+                          if stat.size_diff > 0)
+        alloc_blocks = sum(stat.count_diff for stat in stats
+                           if stat.count_diff > 0)
+    return times, alloc_bytes, alloc_blocks
+
+def run(T, repeat=20, number=5, pattern=None):
+    results = []
+    for name, params, factory in make_cases(T):
+        if pattern and pattern not in name:
+            continue
+        tickline = factory()
+        for op, func in operations(T, tickline):
+            times, alloc_bytes, alloc_blocks = measure(func, repeat, number)
+            times.sort()
+            results.append(dict(
+                case=name, params=params, op=op, repeat=repeat,
+                number=number, median_s=times[len(times) // 2],
+                min_s=times[0], mean_s=sum(times) / len(times),
+                alloc_bytes=alloc_bytes, alloc_blocks=alloc_blocks))
+    return results
+
+def metadata(T):
+    import kivy
+    return dict(package_version=T.__version__, kivy_version=kivy.__version__,
+                python=platform.python_version(),
+                implementation=platform.python_implementation(),
+                machine=platform.machine(), system=platform.system(),
+                gl_backend=os.environ.get('KIVY_GL_BACKEND'),
+                headless=HEADLESS)
+
+def print_table(results, out=sys.stdout):
+    header = '%-22s %-20s %12s %12s %12s %10s' % (
+                'case', 'op', 'median us', 'min us', 'alloc KiB', 'blocks')
+    out.write(header + '\n' + '-' * len(header) + '\n')
+    for r in results:
+        alloc = r['alloc_bytes']
+        out.write('%-22s %-20s %12.1f %12.1f %12s %10s\n' % (
+            r['case'], r['op'], r['median_s'] * 1e6, r['min_s'] * 1e6,
+            '-' if alloc is None else '%.1f' % (alloc / 1024.),
+            '-' if alloc is None else r['alloc_blocks']))
+
+def compare(results, baseline, threshold, out=sys.stdout):
+    '''report the operations whose median time grew by more than
+    ``threshold`` relative to ``baseline``, and return their number.'''
+    old = dict(((r['case'], r['op']), r) for r in baseline['results'])
+    regressions = 0
+    for r in results:
+        o = old.get((r['case'], r['op']))
+        if o is None or not o['median_s']:
+            continue
+        ratio = r['median_s'] / o['median_s']
+        if ratio > threshold:
+            regressions += 1
+            out.write('REGRESSION %s %s: %.1f us -> %.1f us (x%.2f)\n' % (
+                r['case'], r['op'], o['median_s'] * 1e6,
+                r['median_s'] * 1e6, ratio))
+    return regressions
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('-r', '--repeat', type=int, default=20,
+                        help='rounds of timing per operation')
+    parser.add_argument('-n', '--number', type=int, default=5,
+                        help='calls per round')
+    parser.add_argument('-k', '--filter', default=None,
+                        help='only run cases whose name contains this')
+    parser.add_argument('--json', default=None, metavar='PATH',
+                        help='write the results as json to PATH, - for '
+                             'stdout')
+    parser.add_argument('--compare', default=None, metavar='PATH',
+                        help='compare with the json results at PATH')
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help='slowdown ratio counted as a regression')
+    args = parser.parse_args(argv)
+    T = load_package()
+    results = run(T, args.repeat, args.number, args.filter)
+    report = dict(meta=metadata(T), results=results)
+    if args.json == '-':
+        json.dump(report, sys.stdout, indent=1)
+        sys.stdout.write('\n')
+    else:
+        print_table(results)
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(report, f, indent=1)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold, sys.stderr):
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
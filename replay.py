@@ -0,0 +1,401 @@
+'''
+Gesture replay
+==============
+
+Records the touches of a user on a :class:`Tickline`, and replays them
+deterministically without a display, reporting the distribution of the
+time spent per frame, along with the number of redraws and of label
+textures rendered. A laggy session can thus be reproduced offline and a fix
+verified against it.
+
+Record in an app with :class:`GestureRecorder`::
+
+    recorder = GestureRecorder(tickline)
+    ...
+    recorder.save('session.json')
+
+or with the example tickline of this package::
+
+    python replay.py record session.json
+
+then replay::
+
+    python replay.py replay session.json [--fps 60] [--json]
+
+Replaying runs Kivy headless as :mod:`benchmark` does, on a simulated clock:
+every frame advances time by exactly ``1 / fps``, the touches recorded
+during that span are dispatched, then the clock ticks, running the scroll
+effects and redraw triggers. What happens in each frame is thus the same on
+every run; only the time it takes is measured. After the last touch, frames
+go on until the kinetic scroll comes to rest.
+'''
+
+import sys
+import json
+from math import ceil, log
+from timeit import default_timer
+
+try:
+    from .benchmark import load_package
+except (ImportError, ValueError, SystemError):
+    from benchmark import load_package
+
+FORMAT_VERSION = 1
+
+#===============================================================================
+# recording
+#===============================================================================
+
+class GestureRecorder(object):
+    '''records the touches on ``tickline`` that it may handle, in its own
+    coordinates, along with the state it was in when recording started.
+
+    :param tickline: the :class:`Tickline` to record.
+    '''
+
+    def __init__(self, tickline):
+        self.tickline = tickline
+        self.events = []
+        self.start = dict(size=list(tickline.size),
+                          orientation=tickline.orientation,
+                          backward=tickline.backward,
+                          index_0=tickline.index_0,
+                          index_1=tickline.index_1)
+        self._ids = {}
+        self._next_id = 0
+        self._t0 = None
+        tickline.bind(on_touch_down=self._on_touch_down,
+                      on_touch_move=self._on_touch_move,
+                      on_touch_up=self._on_touch_up)
+
+    def stop(self):
+        '''stop recording.'''
+        self.tickline.unbind(on_touch_down=self._on_touch_down,
+                             on_touch_move=self._on_touch_move,
+                             on_touch_up=self._on_touch_up)
+
+    def save(self, path):
+        '''write the recording to ``path`` as json.'''
+        with open(path, 'w') as f:
+            json.dump(self.recording(), f, indent=1)
+
+    def recording(self):
+        return dict(version=FORMAT_VERSION, start=self.start,
+                    events=self.events)
+
+    def _record(self, kind, touch):
+        now = default_timer()
+        if self._t0 is None:
+            self._t0 = now
+        tickline = self.tickline
+        x, y = touch.pos
+        self.events.append([round(now - self._t0, 6), kind,
+                            self._ids[touch.uid],
+                            x - tickline.x, y - tickline.y])
+
+    def _on_touch_down(self, tickline, touch):
+        if touch.grab_current is None and tickline.collide_point(*touch.pos):
+            self._ids[touch.uid] = self._next_id
+            self._next_id += 1
+            self._record('down', touch)
+
+    def _on_touch_move(self, tickline, touch):
+        # grabbed touches are dispatched twice; record them once
+        if touch.grab_current is None and touch.uid in self._ids:
+            self._record('move', touch)
+
+    def _on_touch_up(self, tickline, touch):
+        if touch.grab_current is None and touch.uid in self._ids:
+            self._record('up', touch)
+            del self._ids[touch.uid]
+
+def load_recording(path):
+    with open(path) as f:
+        recording = json.load(f)
+    if recording.get('version') != FORMAT_VERSION:
+        raise ValueError('unsupported recording version %r' %
+                         recording.get('version'))
+    return recording
+
+#===============================================================================
+# replaying
+#===============================================================================
+
+class SimulatedClock(object):
+    '''makes Kivy's clock, and the scroll effects, see a time that only
+    advances with :meth:`advance`, and never sleep.'''
+
+    def __init__(self):
+        self.now = None
+
+    def time(self):
+        return self.now
+
+    def install(self):
+        from kivy.clock import Clock
+        import kivy.effects.kinetic
+        import kivy.effects.scroll
+        self._saved = (Clock.__dict__.get('time'), Clock._max_fps,
+                       kivy.effects.kinetic.time, kivy.effects.scroll.time)
+        self._saved_ticks = (Clock._last_tick, Clock._last_fps_tick,
+                             Clock._duration_ts0)
+        if self.now is None:
+            # events scheduled so far hold the real time, so the simulated
+            # one must start later; a power of 2 keeps the rounding of its
+            # increments the same from run to run
+            self.now = 2. ** ceil(log(max(Clock.get_time(), 1.), 2))
+        Clock.time = self.time
+        Clock._max_fps = 0
+        kivy.effects.kinetic.time = kivy.effects.scroll.time = self.time
+
+    def uninstall(self):
+        from kivy.clock import Clock
+        import kivy.effects.kinetic
+        import kivy.effects.scroll
+        time, Clock._max_fps, kivy.effects.kinetic.time, \
+            kivy.effects.scroll.time = self._saved
+        # the clock would otherwise wait for the real time to catch up with
+        # the simulated one
+        Clock._last_tick, Clock._last_fps_tick, Clock._duration_ts0 = \
+            self._saved_ticks
+        if time is None:
+            del Clock.time
+        else:
+            Clock.time = time
+
+    def advance(self, dt):
+        self.now += dt
+
+def percentile(values, p):
+    '''the ``p``-th percentile of sorted ``values``, by nearest rank.'''
+    if not values:
+        return 0.
+    rank = max(0, min(len(values) - 1,
+                      int(round(p / 100. * len(values) + .5)) - 1))
+    return values[rank]
+
+class GestureReplayer(object):
+    '''replays a recording on ``tickline``, which is brought to the state
+    the recording started in.
+
+    :param tickline: a :class:`Tickline`, at the origin of its coordinates
+        and not in a window.
+    :param recording: a recording, as returned by
+        :meth:`GestureRecorder.recording` or :func:`load_recording`.
+    :param fps: the simulated frame rate.
+    :param settle: the longest time, in seconds, to keep running frames
+        after the last touch, while the kinetic scroll comes to rest.
+    '''
+
+    def __init__(self, tickline, recording, fps=60., settle=10.):
+        self.tickline = tickline
+        self.recording = recording
+        self.fps = float(fps)
+        self.settle = settle
+        self._touch_cls = make_touch_class()
+        start = recording['start']
+        tickline.size = start['size']
+        tickline.orientation = start['orientation']
+        tickline.backward = start['backward']
+        tickline.index_0 = start['index_0']
+        tickline.index_1 = start['index_1']
+
+    def run(self):
+        '''replay the recording and return a report of its frames.'''
+        from kivy.clock import Clock
+        tickline = self.tickline
+        counts = dict(redraws=0, translations=0, labels_rendered=0)
+        restore = self._count_calls(counts)
+        clock = SimulatedClock()
+        clock.install()
+        try:
+            Clock.tick()
+            counts.update(redraws=0, translations=0, labels_rendered=0)
+            frame_times = self._run_frames(clock)
+        finally:
+            clock.uninstall()
+            restore()
+        ordered = sorted(frame_times)
+        ms = 1000.
+        report = dict(frames=len(frame_times),
+                      fps=self.fps,
+                      events=len(self.recording['events']),
+                      frame_ms=dict(
+                        p50=percentile(ordered, 50) * ms,
+                        p95=percentile(ordered, 95) * ms,
+                        p99=percentile(ordered, 99) * ms,
+                        max=ordered[-1] * ms if ordered else 0.,
+                        mean=sum(ordered) / max(1, len(ordered)) * ms),
+                      final_index=[tickline.index_0, tickline.index_1])
+        report.update(counts)
+        return report
+
+    def _run_frames(self, clock):
+        from kivy.clock import Clock
+        events = self.recording['events']
+        dt = 1. / self.fps
+        touches = {}
+        frame_times = []
+        i = 0
+        frame = 0
+        settled_at = None
+        while True:
+            frame += 1
+            clock.advance(dt)
+            start = default_timer()
+            # dispatch the touches of this frame
+            while i < len(events) and events[i][0] < frame * dt:
+                self._dispatch(touches, *events[i][1:])
+                i += 1
+            Clock.tick()
+            Clock.tick_draw()
+            frame_times.append(default_timer() - start)
+            if i == len(events):
+                if settled_at is None:
+                    settled_at = clock.now
+                effect = self.tickline.scroll_effect
+                if not effect.velocity and not touches or \
+                    clock.now - settled_at > self.settle:
+                    break
+        return frame_times
+
+    def _dispatch(self, touches, kind, touch_id, x, y):
+        tickline = self.tickline
+        width, height = tickline.size
+        # a screen one pixel larger, to map touches back to the same pixels
+        args = (x / max(width, 1.), y / max(height, 1.))
+        if kind == 'down':
+            touch = touches[touch_id] = self._touch_cls('replay', touch_id,
+                                                         args, is_touch=True)
+        else:
+            touch = touches[touch_id]
+            touch.move(args)
+        touch.scale_for_screen(width + 1, height + 1)
+        event = dict(down='on_touch_down', move='on_touch_move',
+                     up='on_touch_up')[kind]
+        # as the event loop does: normal dispatch, then to the grabbing
+        # widgets, except for touch downs
+        touch.grab_current = None
+        tickline.dispatch(event, touch)
+        for ref in (touch.grab_list[:] if kind != 'down' else ()):
+            widget = ref()
+            if widget is None:
+                touch.grab_list.remove(ref)
+                continue
+            touch.grab_current = widget
+            touch.grab_state = True
+            widget.dispatch(event, touch)
+            touch.grab_state = False
+            touch.grab_current = None
+        touch.dispatch_done()
+        if kind == 'up':
+            del touches[touch_id]
+
+    def _count_calls(self, counts):
+        '''count redraws, translations and label renderings into ``counts``;
+        return a function undoing it.'''
+        tickline = self.tickline
+        patched = []
+
+        def count(obj, name, key):
+            method = getattr(obj, name)
+
+            def counted(*args, **kw):
+                counts[key] += 1
+                return method(*args, **kw)
+            setattr(obj, name, counted)
+            patched.append((obj, name))
+        count(tickline, 'redraw_', 'redraws')
+        count(tickline, '_translate_graphics', 'translations')
+        for tick in tickline.ticks:
+            count(tick, 'render_label', 'labels_rendered')
+
+        def restore():
+            for obj, name in patched:
+                delattr(obj, name)
+        return restore
+
+def make_touch_class():
+    from kivy.input.motionevent import MotionEvent
+
+    class ReplayTouch(MotionEvent):
+        '''a touch replayed from a recording, in normalized coordinates.'''
+
+        def depack(self, args):
+            self.sx, self.sy = args
+            super(ReplayTouch, self).depack(args)
+    return ReplayTouch
+
+def example_tickline(T):
+    '''the tickline of the example of this package.'''
+    return T.Tickline(ticks=[T.Tick(tick_size=[4, 20], offset=.5),
+                             T.Tick(scale_factor=5., label_global=True),
+                             T.LabellessTick(tick_size=[1, 4],
+                                             scale_factor=25.),
+                             T.DataListTick(data=[-0.3, 1, 1.5, 2, 4, 8, 16,
+                                                  23],
+                                            scale_factor=5.,
+                                            halign='line_right',
+                                            valign='line_top')],
+                      orientation='horizontal', backward=True,
+                      min_index=0, max_index=10)
+
+#===============================================================================
+# command line
+#===============================================================================
+
+def record(path):
+    T = load_package(headless=False)
+    from kivy.base import runTouchApp
+    tickline = example_tickline(T)
+    state = {}
+
+    def start(*args):
+        # record from the laid out state
+        state['recorder'] = GestureRecorder(tickline)
+    from kivy.clock import Clock
+    Clock.schedule_once(start, .5)
+    runTouchApp(tickline)
+    state['recorder'].save(path)
+
+def replay(path, fps, as_json):
+    T = load_package(headless=True)
+    recording = load_recording(path)
+    report = GestureReplayer(example_tickline(T), recording, fps).run()
+    if as_json:
+        json.dump(report, sys.stdout, indent=1)
+        sys.stdout.write('\n')
+        return
+    frame_ms = report['frame_ms']
+    sys.stdout.write(
+        '%(frames)d frames at %(fps)g fps, %(events)d touch events\n'
+        'frame ms: p50 %(p50).3f  p95 %(p95).3f  p99 %(p99).3f  '
+        'max %(max).3f  mean %(mean).3f\n'
+        'redraws %(redraws)d, translations %(translations)d, '
+        'labels rendered %(labels_rendered)d\n'
+        % dict(report, **frame_ms))
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    commands = parser.add_subparsers(dest='command')
+    rec = commands.add_parser('record', help='record touches on the example '
+                                             'tickline in a window')
+    rec.add_argument('path')
+    rep = commands.add_parser('replay', help='replay a recording headless')
+    rep.add_argument('path')
+    rep.add_argument('--fps', type=float, default=60.)
+    rep.add_argument('--json', action='store_true',
+                     help='print the report as json')
+    args = parser.parse_args(argv)
+    if args.command == 'record':
+        record(args.path)
+    elif args.command == 'replay':
+        replay(args.path, args.fps, args.json)
+    else:
+        parser.print_help()
+        return 2
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
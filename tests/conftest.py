@@ -0,0 +1,38 @@
+'''
+The tests run without a display: the package is imported as ``tickline``
+through :func:`benchmark.load_package`, with Kivy's ``mock`` GL backend and
+the graphics stand-ins of :mod:`benchmark`.
+'''
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark import load_package
+
+tickline = load_package(headless=True)
+
+
+@pytest.fixture(autouse=True)
+def empty_label_cache():
+    tickline.label_texture_cache.invalidate()
+    yield
+    tickline.label_texture_cache.invalidate()
+
+
+@pytest.fixture
+def make_tickline():
+    '''a factory of Ticklines, by default horizontal, 800 by 100 pixels,
+    over the indices 0 to 8, with a Tick and a Tick of scale factor 5.'''
+    def make(ticks=None, **kw):
+        if ticks is None:
+            ticks = [tickline.Tick(), tickline.Tick(scale_factor=5.)]
+        kw.setdefault('orientation', 'horizontal')
+        kw.setdefault('size', (800, 100))
+        kw.setdefault('index_0', 0)
+        kw.setdefault('index_1', 8)
+        return tickline.Tickline(ticks=ticks, **kw)
+    return make
@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+import benchmark
+import tickline
+
+
+@pytest.mark.parametrize('case', benchmark.make_cases(tickline),
+                         ids=lambda case: case[0])
+def test_every_case_builds_and_runs(case):
+    name, params, factory = case
+    tl = factory()
+    ops = benchmark.operations(tickline, tl)
+    assert [op for op, _ in ops][:2] == ['redraw', 'display']
+    for op, func in ops:
+        func()
+
+
+def test_register_replays_the_registrations_of_a_redraw():
+    cases = dict((name, factory) for name, _, factory in
+                 benchmark.make_cases(tickline))
+    tl = cases['labels-on']()
+    ops = dict(benchmark.operations(tickline, tl))
+    ops['display']()
+    registered = dict(tl.labeller.registrar)
+    assert registered
+    ops['register']()
+    assert set(tl.labeller.registrar) == set(registered)
+    ops['make_labels']()
+    assert tl.labeller.drawn
+
+
+def test_command_line(tmpdir):
+    path = str(tmpdir.join('results.json'))
+    assert benchmark.main(['-r', '1', '-n', '1', '-k', 'levels-1',
+                           '--json', path]) == 0
+    with open(path) as f:
+        report = json.load(f)
+    assert set(r['op'] for r in report['results']) == \
+        set(['redraw', 'display', 'register', 'make_labels'])
+    assert benchmark.main(['-r', '1', '-n', '1', '-k', 'levels-1',
+                           '--compare', path, '--threshold', '1e9']) == 0
+    # anything is a regression against a threshold of 0
+    assert benchmark.main(['-r', '1', '-n', '1', '-k', 'levels-1',
+                           '--compare', path, '--threshold', '0']) == 1
@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+from tickline import Tick, TickLabeller
+
+
+def overlap(a, b):
+    (ax, ay), (aw, ah) = a
+    (bx, by), (bw, bh) = b
+    return ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah
+
+
+def greedy(registrar):
+    kept = []
+    for key in sorted(registrar, key=lambda k: (registrar[k][-1], k)):
+        entry = registrar[key]
+        rect = entry[-2], entry[1]
+        if not any(overlap(rect, other) for other in kept):
+            kept.append(rect)
+    return sorted(kept)
+
+
+def random_registrar(rnd, vertical, n):
+    registrar = {}
+    for i in range(n):
+        scale_factor = rnd.choice([1., 2.5, 5., 10.])
+        line = rnd.choice([0, 30])
+        along = rnd.uniform(0, 1000)
+        length = rnd.uniform(5, 40)
+        across = rnd.uniform(5, 40)
+        # labels right-aligned against their line, as 'right' labels of a
+        # vertical tickline, have extents across depending on their width
+        if vertical:
+            pos, size = (line - across, along), (across, length)
+        else:
+            pos, size = (along, line), (length, across)
+        registrar[i, 0] = (None, size, None, i, None, pos, scale_factor)
+    return registrar
+
+
+@pytest.mark.parametrize('vertical', [False, True])
+@pytest.mark.parametrize('seed', range(5))
+def test_resolve_collisions_keeps_coarser_labels_without_overlaps(
+        make_tickline, vertical, seed):
+    tl = make_tickline(ticks=[Tick()], size=(1000, 1000),
+                       orientation='vertical' if vertical else 'horizontal')
+    labeller = TickLabeller(tl)
+    registrar = random_registrar(random.Random(seed), vertical, 200)
+    expected = greedy(registrar)
+    labeller.registrar = dict(registrar)
+    labeller.resolve_collisions()
+    kept = sorted((entry[-2], entry[1])
+                  for entry in labeller.registrar.values())
+    assert kept == expected
+    assert len(kept) < len(registrar)
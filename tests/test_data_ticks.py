@@ -0,0 +1,122 @@
+from math import floor
+
+import numpy as np
+import pytest
+from kivy.clock import Clock
+
+from tickline import Tick, DataListTick, ArrayDataListTick, \
+    AggregatedDataListTick, StreamingDataListTick, StyledDataListTick, \
+    SortedDataListTick, SortedIndex, DataPyramid
+
+
+def n_drawn(tick):
+    return len(tick._vertices)
+
+
+@pytest.mark.parametrize('tick_cls', [ArrayDataListTick,
+                                      AggregatedDataListTick,
+                                      StreamingDataListTick,
+                                      StyledDataListTick])
+def test_array_ticks_without_data(make_tickline, tick_cls):
+    tick = tick_cls(scale_factor=5.)
+    tl = make_tickline(ticks=[Tick(), tick], translate_on_pan=True)
+    tl.redraw_()
+    assert n_drawn(tick) == 0
+    assert tick.pan_range(tl) == (-float('inf'), float('inf'))
+    tl.index_0 += .1
+    tl.index_1 += .1
+    Clock.tick()
+    assert n_drawn(tick) == 0
+
+
+@pytest.mark.parametrize('translate_on_pan', [False, True])
+def test_sorted_data_list_tick_edits(make_tickline, translate_on_pan):
+    tick = SortedDataListTick(scale_factor=5.)
+    assert isinstance(tick.data, SortedIndex)
+    tl = make_tickline(ticks=[Tick(), tick],
+                       translate_on_pan=translate_on_pan)
+    tl.redraw_()
+    assert n_drawn(tick) == 0
+    tick.add(7.)
+    tick.add(3.)
+    Clock.tick()
+    assert list(tick.data) == [3., 7.]
+    assert [index for _, index in tick.tick_pos_index_iter(tl)] == [3., 7.]
+    assert n_drawn(tick) == 2
+    tick.update(3., 12.)
+    tick.remove(7.)
+    Clock.tick()
+    assert list(tick.data) == [12.]
+    assert n_drawn(tick) == 1
+
+
+def test_sorted_data_list_tick_takes_any_iterable():
+    tick = SortedDataListTick(data=[5, 1, 3])
+    assert isinstance(tick.data, SortedIndex)
+    assert list(tick.data) == [1, 3, 5]
+    tick.data = None
+    assert list(tick.data) == []
+
+
+@pytest.mark.parametrize('tick_cls, data', [
+    (Tick, None), (DataListTick, [1, 2.5, 4]),
+    (SortedDataListTick, SortedIndex([1, 2.5, 4])),
+    (ArrayDataListTick, np.array([1, 2.5, 4])),
+    (AggregatedDataListTick, np.array([1, 2.5, 4]))])
+def test_overriden_iterators_disable_the_shortcuts(make_tickline, tick_cls,
+                                                  data):
+    kw = {} if data is None else dict(data=data)
+
+    class OwnTicks(tick_cls):
+        def tick_pos_index_iter(self, tl):
+            return iter(())
+    tl = make_tickline(ticks=[tick_cls(**kw), OwnTicks(**kw)])
+    tl.redraw_()
+    default, own = tl.ticks
+    assert default.pan_range(tl) is not None
+    assert list(default.label_indices(tl, 0, 8))
+    assert own.pan_range(tl) is None
+    assert own.label_indices(tl, 0, 8) is None
+
+
+@pytest.mark.parametrize('data', [
+    np.arange(0, 1000, .5),
+    # clustered: most points packed at one end of a long span
+    np.r_[np.linspace(0, 1, 999), [1e6]],
+    np.r_[-np.logspace(5, 0, 500), np.logspace(0, 5, 500)]])
+def test_pyramid_levels(data):
+    pyramid = DataPyramid(data)
+    n = len(data)
+    k_min, k_max = pyramid.min_level, pyramid.max_level
+    assert len(pyramid.level(k_max)[0]) == 1
+    for k in range(k_min, k_max + 1):
+        buckets, counts = pyramid.level(k)
+        expected = DataPyramid.bucket(data, k)
+        assert buckets.tolist() == expected[0].tolist()
+        assert counts.tolist() == expected[1].tolist()
+        assert counts.sum() == n
+        assert len(buckets) <= 2 * n / 2. ** (k - k_min) + 1
+    assert pyramid.level(k_max + 3) is pyramid.level(k_max)
+
+
+def test_aggregated_ticks_draw_a_mark_per_bucket(make_tickline):
+    data = np.arange(0, 100, 1. / 64)
+    tick = AggregatedDataListTick(data=data, min_space=1, resolution=4)
+    tl = make_tickline(ticks=[tick], index_0=0, index_1=100)
+    tl.redraw_()
+    k = tick.lod_level(tl)
+    assert k is not None
+    # buckets at least resolution pixels wide, but no more than twice
+    assert 4 <= 2. ** k * tl.scale < 8
+    buckets = np.unique(np.floor(data / 2. ** k))
+    lo, hi = tick._local_extended_range(tl)
+    in_view = buckets[(buckets >= floor(lo / 2. ** k)) &
+                      (buckets <= floor(hi / 2. ** k))]
+    assert n_drawn(tick) == len(in_view)
+    assert n_drawn(tick) <= tick.count_ticks(tl)
+    assert not tl.labeller.registrar
+    # zoomed in so that the points are far enough apart
+    tl.index_0, tl.index_1 = 10, 10 + 400. / 64
+    tl.redraw_()
+    assert tick.lod_level(tl) is None
+    assert n_drawn(tick) == len(list(tick.tick_iter(tl)))
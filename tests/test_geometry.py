@@ -0,0 +1,95 @@
+import gc
+
+import numpy as np
+
+from kivy.uix.widget import Widget
+
+from tickline import Tick, LabellessTick, GeometryRegistry
+
+
+def make_ticks():
+    return [Tick(tick_size=[4, 20], offset=.5, min_label_space=1),
+            Tick(scale_factor=5., label_global=True, min_label_space=1),
+            LabellessTick(tick_size=[1, 4], scale_factor=25.)]
+
+
+# the view of the rows of a list
+ROW = dict(backward=True, size=(800, 60), index_0=10, index_1=0)
+
+
+def shown(tl):
+    '''the vertices and labels of ``tl``, in window coordinates.'''
+    dx, dy = tl.translate_instr.xy
+    vertices = [np.frombuffer(tick._vertices.data, dtype='f',
+                              count=tick._vertices.size).reshape(-1, 2) +
+                (dx, dy) for tick in tl.ticks]
+    labels = sorted((rect.pos[0] + dx, rect.pos[1] + dy) +
+                    tuple(rect.size) for rect in tl.labeller.pool.rects
+                    if rect.texture is not None)
+    return vertices, labels
+
+
+def test_shared_geometry_matches_computed_geometry(make_tickline):
+    registry = GeometryRegistry()
+    rows = [make_tickline(ticks=make_ticks(), pos=(0, 60 * i),
+                          geometry_registry=registry, **ROW)
+            for i in range(3)]
+    for row in rows:
+        row.redraw_()
+    assert len(registry) == 1
+    for i, row in enumerate(rows):
+        plain = make_tickline(ticks=make_ticks(), pos=(0, 60 * i), **ROW)
+        plain.redraw_()
+        vertices, labels = shown(row)
+        expected_vertices, expected_labels = shown(plain)
+        assert labels and labels == expected_labels
+        assert any(len(v) for v in vertices)
+        assert len(vertices) == len(expected_vertices)
+        for v, expected in zip(vertices, expected_vertices):
+            assert np.allclose(v, expected)
+
+
+class FormatTick(Tick):
+
+    def __init__(self, fmt, **kw):
+        super(FormatTick, self).__init__(**kw)
+        self.fmt = fmt
+
+    def get_label_text(self, index):
+        return self.fmt % index
+
+
+def test_ticks_labelled_their_own_way_do_not_share(make_tickline):
+    registry = GeometryRegistry()
+    short, wide = [make_tickline(ticks=[FormatTick(fmt, min_label_space=1)],
+                                 geometry_registry=registry)
+                   for fmt in ('%d', 'index %d')]
+    short.redraw_()
+    wide.redraw_()
+    assert len(registry) == 0
+    assert max(size[2] for size in shown(short)[1]) < \
+        min(size[2] for size in shown(wide)[1])
+
+
+def test_entries_are_released_with_their_ticklines(make_tickline):
+    registry = GeometryRegistry()
+    parent = Widget()
+    rows = [make_tickline(ticks=make_ticks(), pos=(0, 60 * i),
+                          geometry_registry=registry, **ROW)
+            for i in range(2)]
+    for row in rows:
+        parent.add_widget(row)
+        row.redraw_()
+    assert len(registry) == 1
+    parent.remove_widget(rows[0])
+    assert len(registry) == 1
+    parent.remove_widget(rows[1])
+    assert len(registry) == 0
+    # nor do discarded ticklines keep entries alive
+    row = make_tickline(ticks=make_ticks(), geometry_registry=registry,
+                        **ROW)
+    row.redraw_()
+    assert len(registry) == 1
+    del row
+    gc.collect()
+    assert len(registry) == 0
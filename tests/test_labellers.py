@@ -0,0 +1,185 @@
+import gc
+
+import pytest
+
+from kivy.clock import Clock
+
+from tickline import Tick, TickLabeller, AtlasLabeller, \
+    AsyncLabeller, CompositeLabeller, LabelPrefetcher, LabelTextureCache
+
+
+def drawn_instruction(labeller):
+    if isinstance(labeller, AtlasLabeller):
+        return labeller.instr
+    return labeller.pool.instr
+
+
+@pytest.mark.parametrize('old, new', [(TickLabeller, AtlasLabeller),
+                                      (AtlasLabeller, TickLabeller),
+                                      (TickLabeller, TickLabeller)])
+def test_replaced_labeller_is_taken_off_the_canvas(make_tickline, old, new):
+    tl = make_tickline(labeller_cls=old)
+    tl.redraw_()
+    previous = tl.labeller
+    assert tl.canvas.indexof(drawn_instruction(previous)) >= 0
+    if new is old:
+        tl.labeller_args = {'size': (1, 1)}
+    else:
+        tl.labeller_cls = new
+    tl.redraw_()
+    assert tl.labeller is not previous
+    assert tl.canvas.indexof(drawn_instruction(previous)) < 0
+    assert tl.canvas.indexof(drawn_instruction(tl.labeller)) >= 0
+
+
+def test_composite_labeller_detaches_its_labellers(make_tickline):
+    tl = make_tickline()
+    tl.labeller = CompositeLabeller(tl, {AtlasLabeller: [Tick]})
+    tl.redraw_()
+    atlas = tl.labeller.labellers[0]
+    assert tl.canvas.indexof(atlas.instr) >= 0
+    tl.labeller = TickLabeller(tl)
+    assert tl.canvas.indexof(atlas.instr) < 0
+
+
+def test_replaced_async_labeller_shuts_down(make_tickline):
+    tl = make_tickline(labeller_cls=AsyncLabeller)
+    tl.redraw_()
+    previous = tl.labeller
+    assert previous._pending
+    tl.labeller = TickLabeller(tl)
+    assert not previous._pending
+    assert not previous._trigger_upload.is_triggered
+    with pytest.raises(RuntimeError):
+        previous.executor.submit(len, ())
+    assert tl.canvas.indexof(previous.pool.instr) < 0
+
+
+@pytest.mark.parametrize('overscan', [0, .25, 1])
+def test_prefetch_starts_at_the_overscanned_edge(make_tickline, overscan):
+    tl = make_tickline(overscan=overscan)
+    tl.redraw_()
+    prefetcher = LabelPrefetcher(tl, lookahead=1)
+    tick = tl.densest_tick
+    lo, hi = sorted([tick.extended_index_0(tl), tick.extended_index_1(tl)])
+    assert prefetcher.target_range(2) == pytest.approx((hi, hi + 2))
+    assert prefetcher.target_range(-2) == pytest.approx((lo - 2, lo))
+    assert prefetcher.target_range(0) is None
+    prefetcher.detach()
+
+
+class LegacyLabeller(TickLabeller):
+    # registers entries of three, as TickLabeller did before 0.2.0
+
+    def register(self, tick, tick_index, tick_info):
+        texture = tick.get_label_texture(tick_index)
+        if texture and tick.scale(self.tickline.scale) > tick.min_label_space:
+            key, pos = self.place_label(tick, tick_info, texture.size)
+            registered = self.registrar.get(key)
+            if registered is None or registered[-1] > tick.scale_factor:
+                self.registrar[key] = (texture, pos, tick.scale_factor)
+
+
+def drawn_rects(labeller):
+    return sorted((tuple(pos), tuple(size)) for _, pos, size in
+                  labeller.drawn)
+
+
+def overlapping(rects):
+    return [(a, b) for i, a in enumerate(rects) for b in rects[i + 1:]
+            if a[0][0] < b[0][0] + b[1][0] and b[0][0] < a[0][0] + a[1][0]
+            and a[0][1] < b[0][1] + b[1][1] and b[0][1] < a[0][1] + a[1][1]]
+
+
+@pytest.mark.parametrize('orientation', ['horizontal', 'vertical'])
+def test_entries_of_three_are_still_drawn(make_tickline, orientation):
+    drawn = []
+    for labeller_cls in (TickLabeller, LegacyLabeller):
+        tl = make_tickline(ticks=[Tick(min_label_space=1),
+                                  Tick(scale_factor=5., min_label_space=1)],
+                           orientation=orientation, size=(800, 800),
+                           labeller_cls=labeller_cls)
+        tl.redraw_()
+        drawn.append(drawn_rects(tl.labeller))
+    assert drawn[0]
+    assert drawn[0] == drawn[1]
+
+
+class UnderestimatedTick(Tick):
+
+    def measure_label(self, tick_index):
+        return 1, 1
+
+
+def test_labels_placed_by_their_texture_are_resolved_again(make_tickline):
+    tl = make_tickline(ticks=[UnderestimatedTick(min_label_space=1,
+                                                 min_space=1)],
+                       index_1=100)
+    tl.redraw_()
+    rects = drawn_rects(tl.labeller)
+    assert rects
+    assert not overlapping(rects)
+
+
+def test_prefetcher_fills_the_cache_ahead_of_the_motion(make_tickline):
+    cache = LabelTextureCache()
+    tl = make_tickline(ticks=[Tick(label_cache=cache, min_label_space=1)])
+    tl.redraw_()
+    drawn = set(cache._entries)
+    # not kept by the caller, as in the README
+    LabelPrefetcher(tl, lookahead=1)
+    gc.collect()
+    tl.scroll_effect.velocity = 4
+    tl.in_motion = True
+    for _ in range(3):
+        Clock.tick()
+    texts = sorted(float(key[1]) for key in cache._entries
+                   if key not in drawn)
+    assert texts == [9, 10, 11, 12]
+    tl.in_motion = False
+
+
+class LargeLabelTick(Tick):
+
+    def label_options(self, **kw):
+        kw['font_size'] = 30
+        return kw
+
+
+def registered_labels(labeller):
+    return sorted((tuple(entry[-2]), tuple(labeller.label_size(entry)))
+                  for entry in labeller.registrar.values())
+
+
+@pytest.mark.parametrize('tick_cls', [Tick, LargeLabelTick])
+@pytest.mark.parametrize('orientation', ['horizontal', 'vertical'])
+def test_atlas_labels_are_placed_as_rendered_labels(make_tickline, tick_cls,
+                                                    orientation):
+    labels = []
+    for labeller_cls in (TickLabeller, AtlasLabeller):
+        tl = make_tickline(ticks=[tick_cls(min_label_space=1)],
+                           orientation=orientation, size=(800, 800),
+                           labeller_cls=labeller_cls)
+        tl.redraw_()
+        labels.append(registered_labels(tl.labeller))
+    rendered, composed = labels
+    assert rendered and len(rendered) == len(composed)
+    for ((x, y), (w, h)), ((ax, ay), (aw, ah)) in zip(rendered, composed):
+        # glyphs are padded on their own rather than once per label
+        assert abs(aw - w) <= 2 and abs(ah - h) <= 2
+        assert abs(ax + aw / 2. - x - w / 2.) <= 1
+        assert abs(ay + ah / 2. - y - h / 2.) <= 1
+
+
+def test_unused_atlases_are_emptied(make_tickline):
+    tl = make_tickline(ticks=[LargeLabelTick(min_label_space=1)],
+                       labeller_cls=AtlasLabeller)
+    tl.redraw_()
+    labeller = tl.labeller
+    large, = labeller.atlases.values()
+    assert len(labeller._meshes[large].indices)
+    tl.ticks = [Tick(min_label_space=1)]
+    tl.redraw_()
+    assert len(labeller.atlases) == 2
+    mesh = labeller._meshes[large]
+    assert not len(mesh.vertices) and not len(mesh.indices)
@@ -0,0 +1,76 @@
+from kivy.clock import Clock
+
+from replay import make_touch_class
+
+from tickline import TicklineLink
+
+Touch = make_touch_class()
+
+
+def dispatch(widgets, event, touch):
+    # as the event loop does: normal dispatch, then to the grabbing widgets
+    touch.grab_current = None
+    for widget in widgets:
+        if widget.dispatch(event, touch):
+            break
+    if event != 'on_touch_down':
+        for ref in touch.grab_list[:]:
+            touch.grab_current = ref()
+            touch.grab_state = True
+            ref().dispatch(event, touch)
+            touch.grab_state = False
+        touch.grab_current = None
+
+
+def drag(widgets, start, end):
+    '''press at ``start`` and move to ``end``; return the touch.'''
+    screen = 1000.
+    touch = Touch('test', 1, (start[0] / screen, start[1] / screen),
+                  is_touch=True)
+    touch.scale_for_screen(screen + 1, screen + 1)
+    dispatch(widgets, 'on_touch_down', touch)
+    touch.move((end[0] / screen, end[1] / screen))
+    touch.scale_for_screen(screen + 1, screen + 1)
+    dispatch(widgets, 'on_touch_move', touch)
+    return touch
+
+
+def test_touches_on_a_follower_pan_the_driver(make_tickline):
+    driver = make_tickline(pos=(0, 100))
+    follower = make_tickline(pos=(0, 0))
+    link = TicklineLink(driver, [follower])
+    Clock.tick()
+    touch = drag([driver, follower], (400, 50), (300, 50))
+    assert (driver.index_0, driver.index_1) == (1, 9)
+    assert touch.grab_list[0]() is driver
+    assert not follower._touches
+    link.sync()
+    assert (follower.index_0, follower.index_1) == (1, 9)
+    dispatch([driver, follower], 'on_touch_up', touch)
+    assert not driver._touches
+    # once unlinked, a follower takes its touches again
+    link.unlink()
+    follower.index_0, follower.index_1 = 0, 8
+    Clock.tick()
+    index_0 = driver.index_0
+    touch = drag([driver, follower], (400, 50), (300, 50))
+    assert driver.index_0 == index_0
+    assert (follower.index_0, follower.index_1) == (1, 9)
+    dispatch([driver, follower], 'on_touch_up', touch)
+
+
+def test_ticks_are_paired_again_when_their_settings_change(make_tickline):
+    driver = make_tickline()
+    follower = make_tickline()
+    link = TicklineLink(driver, [follower])
+    tick = follower.ticks[1]
+    assert tick._layout_source is driver.ticks[1]
+    tick.scale_factor = 10.
+    assert tick._layout_source is None
+    driver.ticks[1].scale_factor = 10.
+    assert tick._layout_source is driver.ticks[1]
+    driver.ticks[1].offset = .5
+    assert tick._layout_source is None
+    link.unlink()
+    driver.ticks[1].offset = 0
+    assert tick._layout_source is None
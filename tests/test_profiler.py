@@ -0,0 +1,37 @@
+from tickline import Tick, RedrawProfiler, LabelTextureCache
+
+
+def make_ticks(**kw):
+    return [Tick(**kw), Tick(scale_factor=5., **kw)]
+
+
+def test_textures_created_without_a_cache(make_tickline):
+    tl = make_tickline(ticks=make_ticks(label_cache=None),
+                       profiler=RedrawProfiler())
+    counts = dict(renders=0)
+    for tick in tl.ticks:
+        def counted(text, render_label=tick.render_label, **kw):
+            counts['renders'] += 1
+            return render_label(text, **kw)
+        tick.render_label = counted
+    tl.redraw_()
+    tl.redraw_()
+    records = list(tl.profiler.records)
+    assert counts['renders'] > 0
+    assert [r['label_textures_created'] for r in records] == \
+        [counts['renders'] // 2] * 2
+    assert all(r['label_cache_hits'] == 0 for r in records)
+    # the instance attributes are back as they were
+    assert all('counted' in tick.render_label.__name__ for tick in tl.ticks)
+
+
+def test_textures_created_with_a_cache(make_tickline):
+    tl = make_tickline(ticks=make_ticks(label_cache=LabelTextureCache()),
+                       profiler=RedrawProfiler())
+    tl.redraw_()
+    tl.redraw_()
+    first, second = tl.profiler.records
+    assert first['label_textures_created'] > 0
+    assert second['label_textures_created'] == 0
+    assert second['label_cache_hits'] >= first['label_textures_created']
+    assert all('render_label' not in tick.__dict__ for tick in tl.ticks)
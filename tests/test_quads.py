@@ -0,0 +1,30 @@
+from array import array
+
+from tickline import LabellessTick, QuadBuffer
+
+
+def test_more_quads_than_a_mesh_can_index(make_tickline):
+    tick = LabellessTick(tick_size=[1, 4], min_space=.01)
+    tl = make_tickline(ticks=[tick], size=(40000, 100), index_1=40000)
+    tl.redraw_()
+    n_quads = len(tick._vertices)
+    assert n_quads > 2 * QuadBuffer.max_quads
+    assert len(tick._meshes) == tick._vertices.mesh_count() == 3
+    drawn = 0
+    for mesh in tick._meshes:
+        # the headless meshes keep what they're given as bytes
+        indices = array('H', mesh.indices)
+        vertices = array('f', mesh.vertices)
+        assert max(indices) < len(vertices) // 2
+        drawn += len(indices) // 6
+    assert drawn == n_quads
+
+
+def test_meshes_beyond_the_quads_are_emptied(make_tickline):
+    tick = LabellessTick(tick_size=[1, 4], min_space=.01)
+    tl = make_tickline(ticks=[tick], size=(40000, 100), index_1=40000)
+    tl.redraw_()
+    tl.index_1 = 100
+    tl.redraw_()
+    assert len(tick._vertices) < QuadBuffer.max_quads
+    assert [len(mesh.indices) for mesh in tick._meshes[1:]] == [0, 0]
@@ -0,0 +1,65 @@
+import json
+
+import replay
+import tickline
+
+
+def drag(x0, x1, steps=20, duration=.5):
+    events = [[0., 'down', 0, x0, 50.]]
+    for k in range(1, steps + 1):
+        events.append([k * duration / steps, 'move', 0,
+                       x0 + (x1 - x0) * k / float(steps), 50.])
+    events.append([duration + .01, 'up', 0, x1, 50.])
+    return events
+
+
+def start_state():
+    return dict(size=[800, 100], orientation='horizontal', backward=True,
+                index_0=10, index_1=0)
+
+
+def test_record_and_replay_the_example(tmpdir):
+    tl = replay.example_tickline(tickline)
+    gesture = dict(version=replay.FORMAT_VERSION, start=start_state(),
+                   events=drag(600., 200.))
+    player = replay.GestureReplayer(tl, gesture)
+    recorder = replay.GestureRecorder(tl)
+    report = player.run()
+    recorder.stop()
+    assert report['redraws'] > 0
+    assert report['final_index'] != [10, 0]
+    recorded = recorder.recording()
+    assert [event[1:3] for event in recorded['events']] == \
+        [event[1:3] for event in gesture['events']]
+    assert [round(event[3]) for event in recorded['events']] == \
+        [round(event[3]) for event in gesture['events']]
+
+    path = str(tmpdir.join('session.json'))
+    recorder.save(path)
+    recording = replay.load_recording(path)
+    assert recording['start']['orientation'] == 'horizontal'
+    replayed = replay.GestureReplayer(replay.example_tickline(tickline),
+                                      recording).run()
+    assert replayed['events'] == len(gesture['events'])
+    assert replayed['redraws'] > 0
+    assert replayed['frames'] >= 1
+
+
+def test_replay_is_deterministic():
+    gesture = dict(version=replay.FORMAT_VERSION, start=start_state(),
+                   events=drag(600., 200.) + [[e[0] + 1., ] + e[1:] for e in
+                                               drag(100., 700.)])
+    reports = [replay.GestureReplayer(replay.example_tickline(tickline),
+                                      gesture).run() for _ in range(2)]
+    for key in ('frames', 'redraws', 'translations', 'final_index'):
+        assert reports[0][key] == reports[1][key]
+
+
+def test_command_line_replay(tmpdir, capfd):
+    path = str(tmpdir.join('session.json'))
+    with open(path, 'w') as f:
+        json.dump(dict(version=replay.FORMAT_VERSION, start=start_state(),
+                       events=drag(600., 200.)), f)
+    assert replay.main(['replay', path, '--json']) == 0
+    report = json.loads(capfd.readouterr().out)
+    assert report['redraws'] > 0
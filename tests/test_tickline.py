@@ -0,0 +1,10 @@
+from tickline import Tick, LabellessTick, DataListTick
+
+
+def test_ticks_with_equal_tolerances(make_tickline):
+    ticks = [Tick(scale_factor=5.), DataListTick(data=[1, 2], scale_factor=5.),
+             LabellessTick(scale_factor=25., min_space=1)]
+    tl = make_tickline(ticks=ticks)
+    assert tl.scale_tolerances == [(25., ticks[2]), (50., ticks[0]),
+                                   (50., ticks[1])]
+    tl.redraw_()
@@ -0,0 +1,73 @@
+from kivy.clock import Clock
+from kivy.graphics import PopMatrix
+from kivy.uix.widget import Widget
+
+from tickline import Tick, DataListTick
+
+
+def make_ticks():
+    return [Tick(), DataListTick(data=[.5, 2.5, 7.5], scale_factor=5.)]
+
+
+def count_redraws(tl):
+    counts = dict(redraws=0)
+    redraw_ = tl.redraw_
+
+    def counted(*args):
+        counts['redraws'] += 1
+        return redraw_(*args)
+    tl.redraw_ = counted
+    return counts
+
+
+def test_redraw_is_a_trigger(make_tickline):
+    tl = make_tickline(ticks=make_ticks(), translate_on_pan=True)
+    Clock.tick()
+    counts = count_redraws(tl)
+    tl.redraw()
+    tl.redraw()
+    assert counts['redraws'] == 0
+    Clock.tick()
+    assert counts['redraws'] == 1
+    tl.redraw()
+    tl.redraw.cancel()
+    Clock.tick()
+    assert counts['redraws'] == 1
+
+
+def test_redraw_skips_the_translation(make_tickline):
+    tl = make_tickline(ticks=make_ticks(), translate_on_pan=True)
+    Clock.tick()
+    counts = count_redraws(tl)
+    tl.index_0 += .1
+    tl.index_1 += .1
+    Clock.tick()
+    assert counts['redraws'] == 0
+    assert tl.translate_instr.xy != (0, 0)
+    tl.index_0 += .1
+    tl.index_1 += .1
+    tl.redraw()
+    Clock.tick()
+    assert counts['redraws'] == 1
+    assert tuple(tl.translate_instr.xy) == (0, 0)
+
+
+def test_children_are_drawn_outside_the_translation(make_tickline):
+    tl = make_tickline(ticks=make_ticks(), translate_on_pan=True)
+    first, second, below = Widget(), Widget(), Widget()
+    tl.add_widget(first)
+    tl.add_widget(second)
+    tl.add_widget(below, index=2)
+    after = tl.canvas.after
+    assert isinstance(after.children[0], PopMatrix)
+    # drawn bottom first, as they would be in canvas
+    assert [after.indexof(child.canvas) for child in (below, first, second)] \
+        == [1, 2, 3]
+    assert all(tl.canvas.indexof(child.canvas) < 0
+               for child in (below, first, second))
+    # and the ticks don't take them off the canvas
+    tl.ticks = [Tick()]
+    assert after.indexof(first.canvas) == 2
+    tl.remove_widget(first)
+    assert after.indexof(first.canvas) < 0
+    assert [after.indexof(child.canvas) for child in (below, second)] == [1, 2]
@@ -0,0 +1,84 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from tickline import Tick, DataListTick, ArrayDataListTick
+
+
+RANGES = [(0, 4), (-3.7, -.2), (-1.25, 2.6), (1000.1, 1007.9)]
+
+SETUPS = list(itertools.product([1., 5., 3.3, 2.5],      # scale_factor
+                                [0., .5, .3],           # offset
+                                [False, True],          # backward
+                                ['horizontal', 'vertical'],
+                                RANGES))
+
+
+def view(backward, orientation, index_range):
+    '''the Tickline settings showing ``index_range``.'''
+    lo, hi = index_range
+    index_0, index_1 = (hi, lo) if backward else (lo, hi)
+    return dict(backward=backward, orientation=orientation, size=(800, 300),
+                pos=(13, 7), index_0=index_0, index_1=index_1)
+
+
+def drawn(tick, tl, vectorized):
+    tick.vectorized = vectorized
+    tl.labeller.re_init()
+    tick.display(tl)
+    vertices = tick._vertices
+    return (vertices.data[:vertices.size].tolist(),
+            sorted(tl.labeller.registrar.items(), key=lambda item: item[0]))
+
+
+@pytest.mark.parametrize('scale_factor, offset, backward, orientation, '
+                         'index_range', SETUPS)
+def test_arrays_match_iterator(make_tickline, scale_factor, offset, backward,
+                               orientation, index_range):
+    tick = Tick(scale_factor=scale_factor, offset=offset, min_space=1)
+    tl = make_tickline(ticks=[tick],
+                       **view(backward, orientation, index_range))
+    positions, indices = tick.tick_pos_index_arrays(tl)
+    expected = list(tick.tick_pos_index_iter(tl))
+    assert expected
+    assert list(zip(positions.tolist(), indices.tolist())) == expected
+
+
+@pytest.mark.parametrize('scale_factor, offset, backward, orientation, '
+                         'index_range', SETUPS[::7])
+def test_vectorized_display_matches_scalar(make_tickline, scale_factor,
+                                           offset, backward, orientation,
+                                           index_range):
+    tick = Tick(scale_factor=scale_factor, offset=offset, min_space=1,
+                min_label_space=1)
+    tl = make_tickline(ticks=[tick],
+                       **view(backward, orientation, index_range))
+    expected = drawn(tick, tl, False)
+    assert all(expected)
+    assert drawn(tick, tl, True) == expected
+
+
+def test_too_dense_ticks_give_empty_arrays(make_tickline):
+    tick = Tick(scale_factor=1000.)
+    tl = make_tickline(ticks=[tick], **view(False, 'horizontal', (0, 100)))
+    positions, indices = tick.tick_pos_index_arrays(tl)
+    assert len(positions) == len(indices) == 0
+    assert list(tick.tick_pos_index_iter(tl)) == []
+
+
+@pytest.mark.parametrize('backward, orientation, index_range',
+                         itertools.product([False, True],
+                                           ['horizontal', 'vertical'],
+                                           RANGES))
+def test_array_data_matches_data_list(make_tickline, backward, orientation,
+                                      index_range):
+    data = np.arange(-2000, 30000) * .37
+    listed = DataListTick(data=data.tolist(), scale_factor=5., min_space=1)
+    arrayed = ArrayDataListTick(data=data, scale_factor=5., min_space=1)
+    settings = view(backward, orientation, index_range)
+    tl_listed = make_tickline(ticks=[listed], **settings)
+    tl_arrayed = make_tickline(ticks=[arrayed], **settings)
+    expected = list(listed.tick_pos_index_iter(tl_listed))
+    assert expected
+    assert list(arrayed.tick_pos_index_iter(tl_arrayed)) == expected